@@ -32,7 +32,7 @@ const getBaseURL = () => {
   return 'https://cipher-connect-g9ok.onrender.com';
 };
 
-const API_BASE_URL = getBaseURL();
+export const API_BASE_URL = getBaseURL();
 
 // In-memory token storage
 let accessToken: string | null = null;
@@ -6,8 +6,11 @@ import {
   PostDetail,
   Comment,
   Conversation,
+  ConversationHistory,
   ConversationMessage,
+  InboxConversation,
   Notification,
+  NotificationPage,
   Trend,
   FriendshipRequest,
   LoginRequest,
@@ -22,6 +25,8 @@ import {
   SearchResponse,
   MessageResponse,
   PostDetailResponse,
+  PaginatedResponse,
+  TypeaheadUser,
 } from '../types/api';
 
 // Auth endpoints
@@ -49,8 +54,10 @@ export const authApi = {
 
 // Posts endpoints
 export const postsApi = {
-  list: (trend?: string) =>
-    api.get<Post[]>('/api/posts/', { params: trend ? { trend } : {} }),
+  list: (trend?: string, cursor?: string) =>
+    api.get<PaginatedResponse<Post>>('/api/posts/', {
+      params: { ...(trend ? { trend } : {}), ...(cursor ? { cursor } : {}) },
+    }),
 
   detail: (id: string) =>
     api.get<PostDetailResponse>(`/api/posts/${id}/`),
@@ -105,11 +112,18 @@ export const chatApi = {
   conversations: () =>
     api.get<Conversation[]>('/api/chat/'),
 
-  conversation: (id: string) =>
-    api.get<Conversation>(`/api/chat/${id}/`),
+  inbox: (cursor?: string) =>
+    api.get<PaginatedResponse<InboxConversation>>('/api/chat/inbox/', {
+      params: cursor ? { cursor } : {},
+    }),
+
+  conversation: (id: string, before?: string) =>
+    api.get<ConversationHistory>(`/api/chat/${id}/`, {
+      params: before ? { before } : {},
+    }),
 
   getOrCreate: (userId: string) =>
-    api.get<Conversation>(`/api/chat/${userId}/get-or-create/`),
+    api.get<ConversationHistory>(`/api/chat/${userId}/get-or-create/`),
 
   sendMessage: (conversationId: string, body: string) =>
     api.post<ConversationMessage>(`/api/chat/${conversationId}/send/`, { body }),
@@ -117,17 +131,31 @@ export const chatApi = {
 
 // Notifications endpoints
 export const notificationsApi = {
-  list: () =>
-    api.get<Notification[]>('/api/notifications/'),
+  // Pass the ETag of the list you have; a 304 means it is still current
+  list: (etag?: string) =>
+    api.get<NotificationPage>('/api/notifications/', {
+      headers: etag ? { 'If-None-Match': etag } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    }),
 
   read: (id: string) =>
     api.post<MessageResponse>(`/api/notifications/read/${id}/`),
+
+  unreadCount: () =>
+    api.get<{ count: number }>('/api/notifications/unread-count/'),
+
+  // Marks every unread notification read, or only those up to a `latest` cursor
+  readAll: (upTo?: string) =>
+    api.post<MessageResponse & { count: number }>('/api/notifications/read/', upTo ? { up_to: upTo } : {}),
 };
 
 // Search endpoint
 export const searchApi = {
   search: (query: string) =>
     api.post<SearchResponse>('/api/search/', { query }),
+
+  typeahead: (q: string) =>
+    api.get<TypeaheadUser[]>('/api/search/typeahead/', { params: { q } }),
 };
 
 // Trends endpoint
@@ -0,0 +1,58 @@
+import { API_BASE_URL, getAccessToken } from './client';
+
+// Events pushed by the backend over /ws/, e.g. { type: 'chat.message', ... }
+export interface SocketEvent {
+  type: string;
+  [key: string]: any;
+}
+
+type Handler = (event: SocketEvent) => void;
+
+const RECONNECT_DELAY = 3000;
+
+const handlers = new Set<Handler>();
+let socket: WebSocket | null = null;
+let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+
+const connect = () => {
+  const token = getAccessToken();
+
+  if (socket || !token) return;
+
+  socket = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}/ws/?token=${encodeURIComponent(token)}`);
+
+  socket.onmessage = (message) => {
+    const event: SocketEvent = JSON.parse(message.data);
+    handlers.forEach((handler) => handler(event));
+  };
+
+  socket.onclose = () => {
+    socket = null;
+
+    // Reconnect while anyone is listening; picks up a refreshed access token
+    if (handlers.size > 0 && !reconnectTimer) {
+      reconnectTimer = setTimeout(() => {
+        reconnectTimer = null;
+        connect();
+      }, RECONNECT_DELAY);
+    }
+  };
+};
+
+// One shared connection for the whole app; closed when the last handler leaves
+export const subscribeToEvents = (handler: Handler) => {
+  handlers.add(handler);
+  connect();
+
+  return () => {
+    handlers.delete(handler);
+
+    if (handlers.size === 0) {
+      if (reconnectTimer) {
+        clearTimeout(reconnectTimer);
+        reconnectTimer = null;
+      }
+      socket?.close();
+    }
+  };
+};
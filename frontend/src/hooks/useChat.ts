@@ -1,27 +1,73 @@
-import { useQuery, useMutation, useQueryClient, UseQueryOptions } from '@tanstack/react-query';
+import { useEffect } from 'react';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient, InfiniteData, UseQueryOptions } from '@tanstack/react-query';
 import { chatApi } from '../api/endpoints';
-import { Conversation, ConversationMessage } from '../types/api';
+import { subscribeToEvents } from '../api/socket';
+import { ConversationHistory, ConversationMessage, ConversationMessageRow, InboxConversation } from '../types/api';
+
+export const useConversations = (options?: Omit<UseQueryOptions<InboxConversation[]>, 'queryKey' | 'queryFn'>) => {
+  const queryClient = useQueryClient();
+
+  // A pushed message changes the order, last message and unread counts
+  useEffect(() => {
+    return subscribeToEvents((event) => {
+      if (event.type !== 'chat.message') return;
+      queryClient.invalidateQueries({ queryKey: ['conversations'] });
+    });
+  }, [queryClient]);
 
-export const useConversations = (options?: Omit<UseQueryOptions<Conversation[]>, 'queryKey' | 'queryFn'>) => {
   return useQuery({
     queryKey: ['conversations'],
     queryFn: async () => {
-      const { data } = await chatApi.conversations();
-      return data;
+      const { data } = await chatApi.inbox();
+      return data.results;
     },
     ...options,
   });
 };
 
-export const useConversation = (id: string, options?: Omit<UseQueryOptions<Conversation>, 'queryKey' | 'queryFn'>) => {
-  return useQuery({
+// Pages are fetched newest first; fetchNextPage() loads older messages
+export const useConversation = (id: string) => {
+  const queryClient = useQueryClient();
+
+  // New messages are pushed over the socket instead of polling the history
+  useEffect(() => {
+    if (!id) return;
+
+    return subscribeToEvents((event) => {
+      if (event.type !== 'chat.message' || event.conversation !== id) return;
+
+      const message: ConversationMessageRow = event.message;
+
+      queryClient.setQueryData<InfiniteData<ConversationHistory>>(['conversation', id], (history) => {
+        if (!history || history.pages.some((page) => page.messages.some((m) => m.id === message.id))) return history;
+
+        const [newest, ...older] = history.pages;
+        return { ...history, pages: [{ ...newest, messages: [...newest.messages, message] }, ...older] };
+      });
+    });
+  }, [id, queryClient]);
+
+  return useInfiniteQuery({
     queryKey: ['conversation', id],
-    queryFn: async () => {
-      const { data } = await chatApi.conversation(id);
+    queryFn: async ({ pageParam }) => {
+      const { data } = await chatApi.conversation(id, pageParam);
+
+      if (!pageParam) {
+        // Opening the conversation marks its messages read
+        queryClient.invalidateQueries({ queryKey: ['conversations'] });
+      }
+
       return data;
     },
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next ?? undefined,
+    // One history, oldest message first, as the pages were loaded
+    select: (history): ConversationHistory => ({
+      ...history.pages[0],
+      messages: [...history.pages].reverse().flatMap((page) => page.messages),
+      next: history.pages[history.pages.length - 1].next,
+    }),
     enabled: !!id,
-    ...options,
   });
 };
 
@@ -1,16 +1,41 @@
+import { useEffect, useRef } from 'react';
 import { useQuery, useMutation, useQueryClient, UseQueryOptions } from '@tanstack/react-query';
 import { notificationsApi } from '../api/endpoints';
+import { subscribeToEvents } from '../api/socket';
 import { Notification } from '../types/api';
 
 export const useNotifications = (options?: Omit<UseQueryOptions<Notification[]>, 'queryKey' | 'queryFn'>) => {
+  const queryClient = useQueryClient();
+  const etag = useRef<string | undefined>(undefined);
+
+  // New notifications are pushed over the socket
+  useEffect(() => {
+    return subscribeToEvents((event) => {
+      if (event.type !== 'notification') return;
+
+      const notification: Notification = event.notification;
+
+      queryClient.setQueryData<Notification[]>(['notifications'], (notifications) => {
+        if (notifications?.some((n) => n.id === notification.id)) return notifications;
+        return [notification, ...(notifications || [])];
+      });
+    });
+  }, [queryClient]);
+
   return useQuery({
     queryKey: ['notifications'],
     queryFn: async () => {
-      const { data } = await notificationsApi.list();
-      return data;
+      const cached = queryClient.getQueryData<Notification[]>(['notifications']);
+      const response = await notificationsApi.list(cached ? etag.current : undefined);
+
+      if (response.status === 304 && cached) return cached;
+
+      etag.current = response.headers.etag;
+      return response.data.results;
     },
-    // Refetch notifications every 30 seconds
-    refetchInterval: 30000,
+    // Fallback for missed pushes (e.g. while the socket was reconnecting);
+    // unchanged lists come back as an empty 304
+    refetchInterval: 5 * 60 * 1000,
     ...options,
   });
 };
@@ -28,3 +53,37 @@ export const useReadNotification = () => {
     },
   });
 };
+
+// For the notification badge; refreshed whenever a notification is pushed
+export const useUnreadCount = () => {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    return subscribeToEvents((event) => {
+      if (event.type !== 'notification') return;
+      queryClient.invalidateQueries({ queryKey: ['notifications', 'unread-count'] });
+    });
+  }, [queryClient]);
+
+  return useQuery({
+    queryKey: ['notifications', 'unread-count'],
+    queryFn: async () => {
+      const { data } = await notificationsApi.unreadCount();
+      return data.count;
+    },
+  });
+};
+
+export const useReadAllNotifications = () => {
+  const queryClient = useQueryClient();
+
+  return useMutation({
+    mutationFn: async (upTo?: string) => {
+      const { data } = await notificationsApi.readAll(upTo);
+      return data;
+    },
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: ['notifications'] });
+    },
+  });
+};
@@ -1,15 +1,18 @@
-import { useQuery, useMutation, useQueryClient, UseQueryOptions } from '@tanstack/react-query';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient, UseQueryOptions } from '@tanstack/react-query';
 import { postsApi } from '../api/endpoints';
 import { Post, PostDetail } from '../types/api';
 
-export const usePosts = (trend?: string, options?: Omit<UseQueryOptions<Post[]>, 'queryKey' | 'queryFn'>) => {
-  return useQuery({
+// The feed one page at a time; fetchNextPage() follows the `next` cursor
+export const usePosts = (trend?: string) => {
+  return useInfiniteQuery({
     queryKey: ['posts', trend],
-    queryFn: async () => {
-      const { data } = await postsApi.list(trend);
+    queryFn: async ({ pageParam }) => {
+      const { data } = await postsApi.list(trend, pageParam);
       return data;
     },
-    ...options,
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next ?? undefined,
+    select: (data): Post[] => data.pages.flatMap((page) => page.results),
   });
 };
 
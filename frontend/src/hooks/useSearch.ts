@@ -12,6 +12,18 @@ export const useSearch = () => {
   });
 };
 
+export const useTypeahead = (query: string) => {
+  return useQuery({
+    queryKey: ['typeahead', query],
+    queryFn: async () => {
+      const { data } = await searchApi.typeahead(query);
+      return data;
+    },
+    enabled: query.trim().length > 0,
+    staleTime: 30 * 1000,
+  });
+};
+
 export const useTrends = (options?: Omit<UseQueryOptions<Trend[]>, 'queryKey' | 'queryFn'>) => {
   return useQuery({
     queryKey: ['trends'],
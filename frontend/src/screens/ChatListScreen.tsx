@@ -43,16 +43,9 @@ export default function ChatListScreen({ navigation }: any) {
       data={conversations}
       keyExtractor={(item) => item.id}
       renderItem={({ item: conversation }) => {
-        // Get the other user (not current user)
-        const otherUser = conversation.users.find(
-          (user: any) => user.id !== currentUser?.id
-        ) || conversation.users[0];
-        
-        // Get the last message if available
-        const lastMessage = conversation.messages && conversation.messages.length > 0
-          ? conversation.messages[conversation.messages.length - 1]
-          : null;
-        
+        const otherUser = conversation.other_user;
+        const lastMessage = conversation.last_message;
+
         return (
           <TouchableOpacity 
             style={styles.conversationItem}
@@ -78,12 +71,19 @@ export default function ChatListScreen({ navigation }: any) {
                 <Text style={styles.userName}>{otherUser?.name || 'User'}</Text>
                 <Text style={styles.timestamp}>{conversation.modified_at_formatted}</Text>
               </View>
-              {lastMessage && (
-                <Text style={styles.lastMessage} numberOfLines={1}>
-                  {lastMessage.created_by.id === currentUser?.id ? 'You: ' : ''}
-                  {lastMessage.body}
-                </Text>
-              )}
+              <View style={styles.headerRow}>
+                {lastMessage && (
+                  <Text style={styles.lastMessage} numberOfLines={1}>
+                    {lastMessage.created_by === currentUser?.id ? 'You: ' : ''}
+                    {lastMessage.body}
+                  </Text>
+                )}
+                {conversation.unread_count > 0 && (
+                  <View style={styles.unreadBadge}>
+                    <Text style={styles.unreadText}>{conversation.unread_count}</Text>
+                  </View>
+                )}
+              </View>
             </View>
           </TouchableOpacity>
         );
@@ -165,9 +165,25 @@ const styles = StyleSheet.create({
     color: '#8E8E93',
   },
   lastMessage: {
+    flex: 1,
     fontSize: 14,
     color: '#8E8E93',
   },
+  unreadBadge: {
+    minWidth: 20,
+    height: 20,
+    borderRadius: 10,
+    paddingHorizontal: 6,
+    marginLeft: 8,
+    justifyContent: 'center',
+    alignItems: 'center',
+    backgroundColor: '#007AFF',
+  },
+  unreadText: {
+    fontSize: 12,
+    fontWeight: 'bold',
+    color: 'white',
+  },
   separator: {
     height: 1,
     backgroundColor: '#e0e0e0',
@@ -31,14 +31,14 @@ interface ChatScreenProps {
 
 export default function ChatScreen({ route, navigation }: ChatScreenProps) {
   const { conversationId, otherUser } = route.params;
-  const { data: conversation, isLoading, refetch } = useConversation(conversationId);
+  const { data: conversation, isLoading, refetch, fetchNextPage, hasNextPage, isFetchingNextPage } = useConversation(conversationId);
   const { data: currentUser } = useMe();
   const sendMessageMutation = useSendMessage();
   const [messageText, setMessageText] = useState('');
   const flatListRef = useRef<FlatList>(null);
 
   // Get the other user from conversation
-  const other = conversation?.users.find((u: any) => u.id !== currentUser?.id) || otherUser;
+  const other = Object.values(conversation?.users || {}).find((u) => u.id !== currentUser?.id) || otherUser;
 
   // Set navigation title - must be before any conditional returns
   React.useLayoutEffect(() => {
@@ -50,23 +50,16 @@ export default function ChatScreen({ route, navigation }: ChatScreenProps) {
     }
   }, [navigation, other]);
 
-  // Auto-refresh messages every 3 seconds
-  useEffect(() => {
-    const interval = setInterval(() => {
-      refetch();
-    }, 3000);
-
-    return () => clearInterval(interval);
-  }, [refetch]);
+  // Scroll to bottom when a new message arrives, not when older ones load
+  const lastMessageId = conversation?.messages[conversation.messages.length - 1]?.id;
 
-  // Scroll to bottom when messages update
   useEffect(() => {
-    if (conversation?.messages && conversation.messages.length > 0) {
+    if (lastMessageId) {
       setTimeout(() => {
         flatListRef.current?.scrollToEnd({ animated: true });
       }, 100);
     }
-  }, [conversation?.messages]);
+  }, [lastMessageId]);
 
   const handleSend = () => {
     if (!messageText.trim()) return;
@@ -116,7 +109,8 @@ export default function ChatScreen({ route, navigation }: ChatScreenProps) {
         keyExtractor={(item) => item.id}
         contentContainerStyle={styles.messagesList}
         renderItem={({ item: message }) => {
-          const isMyMessage = message.created_by.id === currentUser?.id;
+          const isMyMessage = message.created_by === currentUser?.id;
+          const author = conversation.users[message.created_by];
 
           return (
             <View
@@ -127,7 +121,7 @@ export default function ChatScreen({ route, navigation }: ChatScreenProps) {
             >
               {!isMyMessage && (
                 <Image
-                  source={{ uri: message.created_by.get_avatar }}
+                  source={{ uri: author?.get_avatar }}
                   style={styles.messageAvatar}
                 />
               )}
@@ -163,6 +157,21 @@ export default function ChatScreen({ route, navigation }: ChatScreenProps) {
             </View>
           );
         }}
+        ListHeaderComponent={
+          hasNextPage ? (
+            <TouchableOpacity
+              style={styles.loadEarlierButton}
+              onPress={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+            >
+              {isFetchingNextPage ? (
+                <ActivityIndicator size="small" color="#007AFF" />
+              ) : (
+                <Text style={styles.loadEarlierText}>Load earlier messages</Text>
+              )}
+            </TouchableOpacity>
+          ) : null
+        }
         ListEmptyComponent={
           <View style={styles.emptyContainer}>
             <Text style={styles.emptyText}>No messages yet</Text>
@@ -277,6 +286,15 @@ const styles = StyleSheet.create({
   theirMessageTime: {
     color: '#8E8E93',
   },
+  loadEarlierButton: {
+    alignItems: 'center',
+    paddingVertical: 8,
+    marginBottom: 8,
+  },
+  loadEarlierText: {
+    fontSize: 14,
+    color: '#007AFF',
+  },
   emptyContainer: {
     flex: 1,
     justifyContent: 'center',
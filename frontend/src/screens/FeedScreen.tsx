@@ -19,6 +19,7 @@ import { usePosts, useLikePost } from '../hooks/usePosts';
 import { useSendFriendRequest, useFriends, useRemoveFriend } from '../hooks/useFriends';
 import { useMe } from '../hooks/useAuth';
 import { useGetOrCreateConversation } from '../hooks/useChat';
+import { useUnreadCount } from '../hooks/useNotifications';
 import PostCard from '../components/PostCard';
 import LightBulbIcon from '../../assets/icons/emoji_objects_24dp_E3E3E3_FILL0_wght400_GRAD0_opsz24.svg';
 import NotificationIcon from '../../assets/icons/notifications_24dp_E3E3E3_FILL0_wght400_GRAD0_opsz24.svg';
@@ -28,12 +29,13 @@ const { width: SCREEN_WIDTH } = Dimensions.get('window');
 
 export default function FeedScreen({ navigation }: any) {
   const isFocused = useIsFocused();
-  const { data: posts, isLoading, error, refetch } = usePosts();
+  const { data: posts, isLoading, error, refetch, fetchNextPage, hasNextPage, isFetchingNextPage } = usePosts();
   const likeMutation = useLikePost();
   const sendFriendRequestMutation = useSendFriendRequest();
   const removeFriendMutation = useRemoveFriend();
   const getOrCreateConversationMutation = useGetOrCreateConversation();
   const { data: currentUser } = useMe();
+  const { data: unreadCount } = useUnreadCount();
   const { data: friendsData, refetch: refetchFriends } = useFriends(currentUser?.id || '');
   const [fullScreenImage, setFullScreenImage] = useState<{ images: any[], index: number } | null>(null);
   const [pendingRequests, setPendingRequests] = useState<Set<string>>(new Set());
@@ -126,6 +128,11 @@ export default function FeedScreen({ navigation }: any) {
           onPress={() => navigation.navigate('Notifications')}
         >
           <NotificationIcon width={28} height={28} fill="#E3E3E3" />
+          {!!unreadCount && (
+            <View style={styles.unreadBadge}>
+              <Text style={styles.unreadBadgeText}>{unreadCount > 99 ? '99+' : unreadCount}</Text>
+            </View>
+          )}
         </TouchableOpacity>
         <Image
           source={require('../../assets/icons/cipher_connect.png')}
@@ -162,6 +169,11 @@ export default function FeedScreen({ navigation }: any) {
             tintColor="#F4C430"
           />
         }
+        onEndReached={() => {
+          if (hasNextPage && !isFetchingNextPage) fetchNextPage();
+        }}
+        onEndReachedThreshold={0.5}
+        ListFooterComponent={isFetchingNextPage ? <ActivityIndicator color="#F4C430" /> : null}
         onViewableItemsChanged={handleViewableItemsChanged.current}
         viewabilityConfig={viewabilityConfig.current}
         // Performance optimizations
@@ -266,6 +278,23 @@ const styles = StyleSheet.create({
     justifyContent: 'center',
     alignItems: 'center',
   },
+  unreadBadge: {
+    position: 'absolute',
+    top: 2,
+    right: 0,
+    minWidth: 18,
+    height: 18,
+    borderRadius: 9,
+    paddingHorizontal: 4,
+    justifyContent: 'center',
+    alignItems: 'center',
+    backgroundColor: '#FF3B30',
+  },
+  unreadBadgeText: {
+    fontSize: 11,
+    fontWeight: 'bold',
+    color: 'white',
+  },
   headerTitle: {
     fontSize: 24,
     fontWeight: '600',
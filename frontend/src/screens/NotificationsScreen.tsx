@@ -9,12 +9,13 @@ import {
   RefreshControl,
 } from 'react-native';
 import { SafeAreaView } from 'react-native-safe-area-context';
-import { useNotifications, useReadNotification } from '../hooks/useNotifications';
+import { useNotifications, useReadNotification, useReadAllNotifications } from '../hooks/useNotifications';
 import { useHandleFriendRequest } from '../hooks/useFriends';
 
 export default function NotificationsScreen() {
   const { data: notifications, isLoading, refetch } = useNotifications();
   const readMutation = useReadNotification();
+  const readAllMutation = useReadAllNotifications();
   const handleFriendRequestMutation = useHandleFriendRequest();
 
   const handleRead = (notificationId: string) => {
@@ -61,6 +62,13 @@ export default function NotificationsScreen() {
 
   return (
     <View style={{ flex: 1 }}>
+      <TouchableOpacity
+        style={styles.readAllButton}
+        onPress={() => readAllMutation.mutate(undefined)}
+        disabled={readAllMutation.isPending}
+      >
+        <Text style={styles.readAllText}>Mark all as read</Text>
+      </TouchableOpacity>
       <FlatList
       data={notifications}
       keyExtractor={(item) => item.id}
@@ -117,6 +125,15 @@ const styles = StyleSheet.create({
     fontSize: 16,
     color: '#8E8E93',
   },
+  readAllButton: {
+    alignItems: 'flex-end',
+    paddingHorizontal: 16,
+    paddingVertical: 10,
+  },
+  readAllText: {
+    fontSize: 14,
+    color: '#007AFF',
+  },
   notificationItem: {
     backgroundColor: 'white',
     padding: 16,
@@ -11,7 +11,7 @@ import {
   Alert,
 } from 'react-native';
 import { SafeAreaView } from 'react-native-safe-area-context';
-import { useSearch } from '../hooks/useSearch';
+import { useSearch, useTypeahead } from '../hooks/useSearch';
 import { useSendFriendRequest, useFriends, useRemoveFriend } from '../hooks/useFriends';
 import { useMe } from '../hooks/useAuth';
 import { useGetOrCreateConversation } from '../hooks/useChat';
@@ -20,6 +20,8 @@ export default function SearchScreen({ navigation }: any) {
   const [query, setQuery] = useState('');
   const [pendingRequests, setPendingRequests] = useState<Set<string>>(new Set());
   const searchMutation = useSearch();
+  // Name suggestions while typing; the full search runs on submit
+  const { data: suggestions } = useTypeahead(query);
   const sendFriendRequestMutation = useSendFriendRequest();
   const removeFriendMutation = useRemoveFriend();
   const { data: currentUser } = useMe();
@@ -71,18 +73,11 @@ export default function SearchScreen({ navigation }: any) {
     });
   };
 
+  // Results belong to the submitted query; editing it goes back to suggestions
   useEffect(() => {
-  if (query.trim() === '') {
     searchMutation.reset();
-  }
   }, [query]);
 
-  useEffect(() => {
-    if (query.trim().length > 4) {
-      searchMutation.mutate(query);
-    }
-  }, [query])
-
   // Get friend IDs from friends data
   const friendIds = new Set(friendsData?.friends?.map((f: any) => f.id) || []);
   // Get pending request IDs from requests data
@@ -187,6 +182,33 @@ export default function SearchScreen({ navigation }: any) {
               <Text style={styles.emptyText}>No results found</Text>
             )}
         </View>
+      ) : query.trim() && suggestions ? (
+        <View style={styles.section}>
+          {suggestions.map((user) => (
+            <TouchableOpacity
+              key={user.id}
+              style={styles.userItem}
+              onPress={() => navigation.navigate('UserProfile', { userId: user.id })}
+            >
+              {user.get_avatar ? (
+                <Image
+                  source={{ uri: user.get_avatar }}
+                  style={styles.avatar}
+                />
+              ) : (
+                <View style={[styles.avatar, styles.avatarPlaceholder]}>
+                  <Text style={styles.avatarText}>
+                    {user.name?.charAt(0)?.toUpperCase() || '?'}
+                  </Text>
+                </View>
+              )}
+              <View style={styles.userInfo}>
+                <Text style={styles.userName}>{user.name}</Text>
+                <Text style={styles.userEmail}>{user.email}</Text>
+              </View>
+            </TouchableOpacity>
+          ))}
+        </View>
       ) : (
         <View style={styles.section}>
           <View style={styles.header}>
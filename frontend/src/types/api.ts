@@ -30,6 +30,12 @@ export interface Post {
   created_by: User;
   created_at_formatted: string;
   attachments?: PostAttachment[];
+  i_liked?: boolean;
+}
+
+export interface PaginatedResponse<T> {
+  results: T[];
+  next: string | null;
 }
 
 export interface PresignedUrlResponse {
@@ -64,12 +70,46 @@ export interface Conversation {
   messages?: ConversationMessage[];
 }
 
+// A message in conversation history; users are looked up in ConversationHistory.users
+export interface ConversationMessageRow {
+  id: string;
+  sent_to: string;
+  created_by: string;
+  created_at_formatted: string;
+  body: string;
+}
+
+// One page of a conversation's messages, oldest first; `next` fetches older ones
+export interface ConversationHistory {
+  id: string;
+  modified_at_formatted: string;
+  users: Record<string, User>;
+  messages: ConversationMessageRow[];
+  next: string | null;
+}
+
+// A row of the chat inbox, most recently active conversation first
+export interface InboxConversation {
+  id: string;
+  modified_at_formatted: string;
+  other_user: User;
+  last_message: ConversationMessageRow | null;
+  unread_count: number;
+}
+
 export interface Notification {
   id: string;
   body: string;
   type_of_notification: string;
   post_id?: string;
   created_for_id: string;
+  created_by?: User;
+  created_at?: string;
+}
+
+export interface NotificationPage extends PaginatedResponse<Notification> {
+  // Cursor of the page's newest notification, for marking read up to it
+  latest: string | null;
 }
 
 export interface Trend {
@@ -132,9 +172,17 @@ export interface ProfilePostsResponse {
   can_send_friendship_request: boolean;
 }
 
+export interface TypeaheadUser {
+  id: string;
+  name: string;
+  email: string;
+  get_avatar: string;
+}
+
 export interface SearchResponse {
   users: User[];
   posts: Post[];
+  next_page: number | null;
 }
 
 export interface MessageResponse {
@@ -0,0 +1,25 @@
+#!/bin/sh
+
+# Serves the ASGI app for WebSocket connections (/ws/); the REST API stays on gunicorn.
+# Workers exchange events through Redis (PUBSUB in settingprod.py).
+
+NAME='wey_ws'
+DJANGODIR=/webapps/wey/wey_backend
+SOCKFILE=/webapps/wey/run/uvicorn.sock
+NUM_WORKERS=2
+DJANGO_SETTINGS_MODULE=wey_backend.settingprod
+DJANGO_ASGI_MODULE=wey_backend.asgi
+
+cd $DJANGODIR
+source ../env/bin/activate
+
+export DJANGO_SETTINGS_MODULE=$DJANGO_SETTINGS_MODULE
+export PYTHONPATH=$DJANGODIR:$PYTHONPATH
+
+RUNDIR=$(dirname $SOCKFILE)
+test -d $RUNDIR || mkdir -p $RUNDIR
+
+exec ../env/bin/uvicorn ${DJANGO_ASGI_MODULE}:application \
+--uds $SOCKFILE \
+--workers $NUM_WORKERS \
+--log-level info
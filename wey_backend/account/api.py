@@ -6,13 +6,13 @@ from django.http import JsonResponse
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 
 from notification.utils import create_notification
+from wey_backend.cache import get_or_compute
 
 from .forms import SignupForm, ProfileForm
-from .models import User, FriendshipRequest, Connection
+from .graph import graph
+from .models import User, FriendshipRequest
 from .serializers import UserSerializer, FriendshipRequestSerializer
 
-from django.db.models import Q
-import networkx as nx
 
 @api_view(['GET'])
 def me(request):
@@ -89,38 +89,40 @@ def friends(request, pk):
     }, safe=False)
 
 
+MAX_GRAPH_NODES = 500
+
+
 @api_view(['GET'])
 def get_connections(request):
-    # Returns 2 levels of connections
-    user = User.objects.get(pk=request.user.pk)
+    # Returns up to `depth` (1 or 2) levels of connections as an edge list
+    try:
+        depth = 1 if int(request.GET.get('depth', 2)) < 2 else 2
+        min_weight = float(request.GET.get('min_weight', 0))
+        max_nodes = min(int(request.GET.get('max_nodes', MAX_GRAPH_NODES)), MAX_GRAPH_NODES)
+    except ValueError:
+        return JsonResponse({'error': 'invalid parameters'}, status=400)
 
-    G = nx.Graph()
-    direct_connections = Connection.objects.filter(Q(user1=user) | Q(user2=user),
-                                                Q(is_connected=True))
+    edges = graph.ego_edges(request.user.id, depth=depth, min_weight=min_weight, max_nodes=max_nodes)
 
-    for direct_connection in direct_connections:
-        friend = direct_connection.user1 if user != direct_connection.user1 else direct_connection.user2
-        G.add_edge(str(user.id), str(friend.id), weight=direct_connection.score)
+    graph_data = [
+        {'source': str(source), 'target': str(target), 'weight': weight}
+        for source, target, weight in edges
+    ]
 
-        secondary_connections = Connection.objects.filter(Q(user1=friend) | Q(user2=friend),
-                                                       Q(is_connected=True))
-        
-        for secondary_connection in secondary_connections:
-            second_friend = secondary_connection.user1 if friend != secondary_connection.user1 else secondary_connection.user2
-            G.add_edge(str(friend.id), str(second_friend.id), weight=secondary_connection.score)
-    
-    graph = nx.node_link_data(G).get('edges', [])
-    print(f"Returning graph: {graph}")
     return JsonResponse({
-        'graph': graph
+        'graph': graph_data
     })
         
 
 @api_view(['GET'])
 def my_friendship_suggestions(request):
-    serializer = UserSerializer(request.user.people_you_may_know.all(), many=True)
+    data = get_or_compute(
+        'suggestions',
+        lambda: UserSerializer(request.user.people_you_may_know.all(), many=True).data,
+        scope=str(request.user.id)
+    )
 
-    return JsonResponse(serializer.data, safe=False)
+    return JsonResponse(data, safe=False)
 
 
 @api_view(['POST'])
@@ -164,7 +166,7 @@ def send_friendship_request(request, pk):
     if not check1 or not check2:
         friendrequest = FriendshipRequest.objects.create(created_for=user, created_by=request.user)
 
-        notification = create_notification(request, 'new_friendrequest', friendrequest_id=friendrequest.id)
+        create_notification(request.user, user, 'new_friendrequest')
 
         return JsonResponse({'message': 'friendship request created'})
     else:
@@ -179,18 +181,12 @@ def handle_request(request, pk, status):
     friendship_request.status = status
     friendship_request.save()
 
-    # Add friend (ManyToMany 'self' is symmetrical, so only add once)
+    # Add friend (ManyToMany 'self' is symmetrical, so only add once).
+    # Both friends_count columns are updated by the m2m_changed signal.
     request.user.friends.add(user)
-    
-    # Count actual friends and update counts
-    request.user.friends_count = request.user.friends.count()
-    request.user.save()
-    
-    user.refresh_from_db()
-    user.friends_count = user.friends.count()
-    user.save()
 
-    notification = create_notification(request, 'accepted_friendrequest', friendrequest_id=friendship_request.id)
+    # Goes to whoever sent the request
+    create_notification(request.user, user, 'accepted_friendrequest')
 
     return JsonResponse({'message': 'friendship request updated'})
 
@@ -205,26 +201,15 @@ def remove_friend(request, pk):
     # Check if they are friends
     print(f"Current user: {request.user.name}", flush=True)
     print(f"Target user: {user.name}", flush=True)
-    print(f"Friends list: {[f.name for f in request.user.friends.all()]}", flush=True)
     sys.stdout.flush()
     
-    if user in request.user.friends.all():
+    if request.user.friends.filter(pk=user.pk).exists():
         print(f"=== {user.name} IS A FRIEND! Removing... ===", flush=True)
         sys.stdout.flush()
-        # Remove from each other's friends list (ManyToMany handles both sides)
+        # Remove from each other's friends list (ManyToMany handles both sides).
+        # Both friends_count columns are updated by the m2m_changed signal.
         request.user.friends.remove(user)
         
-        # Count actual friends and update counts
-        request.user.friends_count = request.user.friends.count()
-        request.user.save()
-        
-        user.refresh_from_db()
-        user.friends_count = user.friends.count()
-        user.save()
-        
-        print(f"After removal - {request.user.name} has {request.user.friends_count} friends", flush=True)
-        print(f"After removal - {user.name} has {user.friends_count} friends", flush=True)
-        
         # Delete the friendship requests between them
         FriendshipRequest.objects.filter(created_for=request.user, created_by=user).delete()
         FriendshipRequest.objects.filter(created_for=user, created_by=request.user).delete()
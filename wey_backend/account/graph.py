@@ -0,0 +1,269 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+from django.utils import timezone
+
+from wey_backend.rebuild import PeriodicRebuild
+
+from .models import Connection, User, decay_score
+
+
+# Friendship and score changes only reach the overlay of the worker that
+# made them, so other workers' graphs lag by up to this long.
+REBUILD_INTERVAL = 10 * 60
+
+# Pending incremental changes are folded into fresh arrays past this size
+MAX_PENDING_CHANGES = 10000
+
+
+def _pair(a, b):
+    return (a, b) if a < b else (b, a)
+
+
+class SocialGraph(PeriodicRebuild):
+    """
+    Friendship graph held in CSR (compressed sparse row) form.
+
+    User UUIDs are mapped to dense ints. The neighbours of node i are
+    indices[indptr[i]:indptr[i + 1]], with edge weights (the time-decayed
+    Connection.score, 0 for friends without a scored connection) alongside
+    in weights.
+    Connections that cross the score threshold become friendships, so the
+    friends table is the source of truth for which edges exist.
+    Incremental updates go to a small overlay until the next rebuild.
+    """
+
+    rebuild_interval = REBUILD_INTERVAL
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.RLock()
+        self._reset([], np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+
+    def _reset(self, ids, indptr, indices, weights):
+        self._ids = list(ids)
+        self._index = {user_id: i for i, user_id in enumerate(self._ids)}
+        self._indptr = indptr
+        self._indices = indices
+        self._weights = weights
+        # Overlay: node -> {neighbour: weight} for added/re-weighted edges
+        self._added = {}
+        self._removed = set()
+        self._pending = 0
+
+    def _load_edges(self):
+        edges = {}
+
+        for a, b in User.friends.through.objects.values_list('from_user_id', 'to_user_id').iterator():
+            edges.setdefault(_pair(a, b), 0.0)
+
+        now = timezone.now()
+        connections = Connection.objects.values_list('user1_id', 'user2_id', 'score', 'decayed_at', 'last_interaction')
+
+        for a, b, score, decayed_at, last_interaction in connections.iterator():
+            key = _pair(a, b)
+
+            if key in edges:
+                edges[key] = decay_score(score, decayed_at or last_interaction, now)
+
+        return edges
+
+    def rebuild(self):
+        edges = self._load_edges()
+
+        ids = sorted({user_id for pair in edges for user_id in pair})
+        index = {user_id: i for i, user_id in enumerate(ids)}
+
+        count = len(edges)
+        rows = np.empty(2 * count, dtype=np.int32)
+        cols = np.empty(2 * count, dtype=np.int32)
+        weights = np.empty(2 * count, dtype=np.float32)
+
+        for n, ((a, b), weight) in enumerate(edges.items()):
+            rows[2 * n], cols[2 * n] = index[a], index[b]
+            rows[2 * n + 1], cols[2 * n + 1] = index[b], index[a]
+            weights[2 * n] = weights[2 * n + 1] = weight
+
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(ids)), out=indptr[1:])
+
+        with self._lock:
+            self._reset(ids, indptr, cols[order], weights[order])
+            self._mark_built()
+
+    def is_stale(self):
+        return super().is_stale() or self._pending > MAX_PENDING_CHANGES
+
+    def _node(self, user_id):
+        if user_id not in self._index:
+            self._index[user_id] = len(self._ids)
+            self._ids.append(user_id)
+
+        return self._index[user_id]
+
+    def _neighbors(self, i):
+        result = {}
+
+        if i + 1 < len(self._indptr):
+            start, end = self._indptr[i], self._indptr[i + 1]
+            result = dict(zip(self._indices[start:end].tolist(), self._weights[start:end].tolist()))
+
+        for j in list(result):
+            if _pair(i, j) in self._removed:
+                del result[j]
+
+        result.update(self._added.get(i, {}))
+
+        return result
+
+    # Incremental updates
+
+    def set_edge(self, a, b, weight=None):
+        if self._built_at is None:
+            return
+
+        with self._lock:
+            i, j = self._node(a), self._node(b)
+            key = _pair(i, j)
+
+            if weight is None:
+                weight = self._neighbors(i).get(j, 0.0)
+
+            self._removed.discard(key)
+            self._added.setdefault(i, {})[j] = float(weight)
+            self._added.setdefault(j, {})[i] = float(weight)
+            self._pending += 1
+
+    def update_weight(self, a, b, weight):
+        # Only re-weights an existing edge; scores below the threshold don't create one
+        if self._built_at is None:
+            return
+
+        with self._lock:
+            if a in self._index and b in self._index and self._index[b] in self._neighbors(self._index[a]):
+                self.set_edge(a, b, weight)
+
+    def remove_edge(self, a, b):
+        if self._built_at is None:
+            return
+
+        with self._lock:
+            if a in self._index and b in self._index:
+                i, j = self._index[a], self._index[b]
+                self._added.get(i, {}).pop(j, None)
+                self._added.get(j, {}).pop(i, None)
+                self._removed.add(_pair(i, j))
+                self._pending += 1
+
+    # Queries
+
+    def neighbors(self, user_id, min_weight=None):
+        self._ensure_fresh()
+
+        with self._lock:
+            if user_id not in self._index:
+                return {}
+
+            return {
+                self._ids[j]: weight
+                for j, weight in self._neighbors(self._index[user_id]).items()
+                if min_weight is None or weight >= min_weight
+            }
+
+    def k_hop(self, user_id, k, min_weight=None):
+        """
+        Users within k hops, mapped to their distance (the user itself excluded).
+        """
+        distances = {user_id: 0}
+        frontier = [user_id]
+
+        for depth in range(1, k + 1):
+            next_frontier = []
+
+            for current in frontier:
+                for neighbor in self.neighbors(current, min_weight):
+                    if neighbor not in distances:
+                        distances[neighbor] = depth
+                        next_frontier.append(neighbor)
+
+            frontier = next_frontier
+
+        del distances[user_id]
+        return distances
+
+    def ego_edges(self, user_id, depth=2, min_weight=None, max_nodes=None):
+        """
+        Edges (source, target, weight) found by expanding depth hops out
+        from the user, strongest first: every edge of the users up to
+        depth - 1 hops away, so the outermost users appear only as edge
+        targets. Stops adding users at max_nodes.
+        """
+        nodes = {user_id}
+        edges = {}
+        frontier = [user_id]
+
+        for _ in range(depth):
+            rows = []
+
+            for source in frontier:
+                rows += [(source, target, weight) for target, weight in self.neighbors(source, min_weight).items()]
+
+            rows.sort(key=lambda row: -row[2])
+            next_frontier = []
+
+            for source, target, weight in rows:
+                if target not in nodes:
+                    if max_nodes is not None and len(nodes) >= max_nodes:
+                        continue
+
+                    nodes.add(target)
+                    next_frontier.append(target)
+
+                edges.setdefault(_pair(source, target), (source, target, weight))
+
+            frontier = next_frontier
+
+        return list(edges.values())
+
+    def mutual_friend_count(self, a, b):
+        return len(self.neighbors(a).keys() & self.neighbors(b).keys())
+
+    def shortest_path(self, a, b, max_depth=6):
+        """
+        Breadth-first shortest path from a to b as a list of user ids, or None.
+        """
+        if a == b:
+            return [a]
+
+        parents = {a: None}
+        queue = deque([(a, 0)])
+
+        while queue:
+            current, depth = queue.popleft()
+
+            if depth >= max_depth:
+                continue
+
+            for neighbor in self.neighbors(current):
+                if neighbor in parents:
+                    continue
+
+                parents[neighbor] = current
+
+                if neighbor == b:
+                    path = [b]
+
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+
+                    return path[::-1]
+
+                queue.append((neighbor, depth + 1))
+
+        return None
+
+
+graph = SocialGraph()
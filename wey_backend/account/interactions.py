@@ -0,0 +1,184 @@
+import logging
+
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from wey_backend.buffer import WriteBuffer
+
+from .graph import graph
+from .models import Connection, FRIENDSHIP_THRESHOLD, User, ordered_pair
+
+logger = logging.getLogger(__name__)
+
+
+# Connection score points per interaction
+LIKE_POINTS = 0.5
+COMMENT_POINTS = 1
+MESSAGE_POINTS = 2
+
+# Pairs looked up per query when flushing
+FLUSH_BATCH_SIZE = 500
+
+# Flushes a pair may fail (lost insert race, deadlock) before it is dropped
+MAX_ATTEMPTS = 3
+
+UPDATE_FIELDS = ['score', 'last_interaction', 'decayed_at', 'is_connected']
+
+
+def _add_points(connection, points, at, promoted):
+    connection.add_interaction(points, at)
+
+    if connection.score > FRIENDSHIP_THRESHOLD and not connection.is_connected:
+        promoted.append(connection)
+
+    connection.is_connected = connection.score > FRIENDSHIP_THRESHOLD
+
+
+def _write_batch(batch):
+    """
+    Applies one batch in a single transaction. Returns the written
+    connections and those that crossed the friendship threshold.
+    """
+    lookup = Q()
+
+    for a, b in batch:
+        lookup |= Q(user1_id=a, user2_id=b)
+
+    promoted = []
+
+    with transaction.atomic():
+        existing = {
+            (connection.user1_id, connection.user2_id): connection
+            for connection in Connection.objects.select_for_update().filter(lookup)
+        }
+        new = []
+
+        for key, (points, at, attempts) in batch.items():
+            connection = existing.get(key)
+
+            if connection is None:
+                connection = Connection(user1_id=key[0], user2_id=key[1])
+                new.append(connection)
+
+            _add_points(connection, points, at, promoted)
+
+        Connection.objects.bulk_update(existing.values(), UPDATE_FIELDS)
+        Connection.objects.bulk_create(new)
+
+    return [*existing.values(), *new], promoted
+
+
+def _write_pair(pair, entry):
+    """
+    Applies one pair on its own, for when its batch failed. Same return
+    value as _write_batch.
+    """
+    points, at, attempts = entry
+    promoted = []
+
+    with transaction.atomic():
+        connection, created = Connection.objects.select_for_update().get_or_create_pair(*pair)
+        _add_points(connection, points, at, promoted)
+        Connection.objects.bulk_update([connection], UPDATE_FIELDS)
+
+    return [connection], promoted
+
+
+def apply_interactions(pending):
+    """
+    Applies {(user_a, user_b): [points, last_at, attempts]} to the Connection
+    rows in one locked read and one bulk write per batch, then promotes
+    pairs that crossed the friendship threshold.
+
+    When a batch fails, its pairs are written one by one so only the
+    failing ones are returned, with attempts bumped, for the caller to
+    retry. Pairs of deleted users and pairs that failed MAX_ATTEMPTS
+    times are dropped.
+    """
+    user_ids = {user_id for pair in pending for user_id in pair}
+    live_ids = {str(user_id) for user_id in User.objects.filter(pk__in=user_ids).values_list('id', flat=True)}
+    items = []
+
+    for pair, entry in pending.items():
+        if str(pair[0]) in live_ids and str(pair[1]) in live_ids:
+            items.append((pair, entry))
+        else:
+            logger.info('dropping interaction of deleted user: %s', pair)
+
+    retry = {}
+    promoted = []
+
+    for start in range(0, len(items), FLUSH_BATCH_SIZE):
+        batch = dict(items[start:start + FLUSH_BATCH_SIZE])
+
+        try:
+            written, batch_promoted = _write_batch(batch)
+        except (IntegrityError, OperationalError):
+            written, batch_promoted = [], []
+
+            for pair, entry in batch.items():
+                try:
+                    pair_written, pair_promoted = _write_pair(pair, entry)
+                except (IntegrityError, OperationalError):
+                    points, at, attempts = entry
+
+                    if attempts + 1 >= MAX_ATTEMPTS:
+                        logger.exception('dropping interaction after %d attempts: %s', attempts + 1, pair)
+                    else:
+                        logger.warning('retrying interaction: %s', pair, exc_info=True)
+                        retry[pair] = [points, at, attempts + 1]
+
+                    continue
+
+                written += pair_written
+                batch_promoted += pair_promoted
+
+        promoted += batch_promoted
+
+        for connection in written:
+            graph.update_weight(connection.user1_id, connection.user2_id, connection.decayed_score())
+
+    users = User.objects.in_bulk({user_id for c in promoted for user_id in (c.user1_id, c.user2_id)})
+
+    for connection in promoted:
+        if connection.user1_id in users and connection.user2_id in users:
+            users[connection.user1_id].friends.add(users[connection.user2_id])
+
+    return retry
+
+
+class InteractionBuffer(WriteBuffer):
+    """
+    Coalesces connection score increments per user pair in memory and
+    writes them in batches, off the request path.
+    """
+
+    interval_setting = 'CONNECTION_BUFFER_FLUSH_INTERVAL'
+
+    def new_batch(self):
+        return {}
+
+    def collect(self, batch, item):
+        pair, points, at, attempts = item
+        entry = batch.setdefault(pair, [0.0, at, attempts])
+        entry[0] += points
+        entry[1] = max(entry[1], at)
+        entry[2] = max(entry[2], attempts)
+
+    def record(self, user_a_id, user_b_id, points, at=None):
+        if user_a_id == user_b_id:
+            return
+
+        self.add((ordered_pair(user_a_id, user_b_id), points, at or timezone.now(), 0))
+
+    def write(self, batch):
+        retry = apply_interactions(batch)
+
+        for pair, (points, at, attempts) in retry.items():
+            self.add((pair, points, at, attempts))
+
+
+buffer = InteractionBuffer()
+record = buffer.record
+flush = buffer.flush
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from account.models import Connection, FRIENDSHIP_THRESHOLD
+
+
+class Command(BaseCommand):
+    help = 'Rewrite connection scores with time decay applied and drop friendships that fell below the threshold'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        connections = Connection.objects.filter(score__gt=0).order_by('id')
+        last_id = None
+        updated = 0
+        dropped = []
+
+        while True:
+            batch = connections if last_id is None else connections.filter(id__gt=last_id)
+
+            # Locked like the interaction buffer's flush, so increments it
+            # writes meanwhile aren't overwritten with the decayed value
+            with transaction.atomic():
+                batch = list(batch.select_for_update()[:options['batch_size']])
+                now = timezone.now()
+
+                if not batch:
+                    break
+
+                for connection in batch:
+                    connection.score = connection.decayed_score(now)
+                    connection.decayed_at = now
+
+                    if connection.is_connected and connection.score <= FRIENDSHIP_THRESHOLD:
+                        connection.is_connected = False
+                        dropped.append(connection)
+
+                # One UPDATE per batch instead of save() per row
+                Connection.objects.bulk_update(batch, ['score', 'decayed_at', 'is_connected'])
+
+            updated += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f'{updated} connections decayed')
+
+        for connection in dropped:
+            connection.user1.friends.remove(connection.user2)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Decayed {updated} connections, unfriended {len(dropped)} pairs'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from account.suggestions import CHUNK_SIZE, SUGGESTIONS_PER_USER, FriendSuggestionsJob
+from wey_backend.jobs import run_job
+
+
+class Command(BaseCommand):
+    help = 'Recompute people-you-may-know suggestions for every user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=SUGGESTIONS_PER_USER)
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--resume', action='store_true', help='Skip shards finished by a crashed run')
+
+    def handle(self, *args, **options):
+        job = FriendSuggestionsJob(limit=options['limit'], chunk_size=options['chunk_size'])
+
+        run_job(job, workers=options['workers'], resume=options['resume'], report=self.stdout.write)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Stored {job.stored} suggestions'))
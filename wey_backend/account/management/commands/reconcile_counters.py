@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from account.models import User
+from post.models import Post
+
+
+def count_friends():
+    Friends = User.friends.through
+    return Friends.objects.filter(from_user=OuterRef('pk')).values('from_user').annotate(c=Count('pk')).values('c')
+
+
+def count_posts():
+    return Post.objects.filter(created_by=OuterRef('pk')).values('created_by').annotate(c=Count('pk')).values('c')
+
+
+# Counter column -> per-user count of the rows it mirrors
+COUNTERS = {
+    'friends_count': count_friends,
+    'posts_count': count_posts,
+}
+
+
+class Command(BaseCommand):
+    help = 'Recompute the counter columns of every user (friends_count, posts_count) from their source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fields', nargs='*', help=f'Counters to recompute ({", ".join(COUNTERS)}), all by default')
+
+    def handle(self, *args, **options):
+        unknown = set(options['fields']) - set(COUNTERS)
+
+        if unknown:
+            raise CommandError(f'Unknown counters: {", ".join(sorted(unknown))}')
+
+        for field in options['fields'] or COUNTERS:
+            actual = Coalesce(Subquery(COUNTERS[field]()), 0)
+
+            drifted = User.objects.annotate(actual=actual).exclude(**{field: F('actual')}).count()
+            # One UPDATE for every user, no rows loaded into Python
+            User.objects.update(**{field: actual})
+
+            self.stdout.write(self.style.SUCCESS(f'✓ Recomputed {field}, {drifted} users were out of date'))
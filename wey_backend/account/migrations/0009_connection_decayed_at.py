@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0008_alter_connection_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='connection',
+            name='decayed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
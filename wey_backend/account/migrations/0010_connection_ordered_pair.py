@@ -0,0 +1,64 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Copied from account.models at the time of writing
+SCORE_HALF_LIFE_SECONDS = 30 * 24 * 60 * 60
+
+
+def _decayed(connection, now):
+    since = connection.decayed_at or connection.last_interaction
+
+    if since is None:
+        return connection.score
+
+    elapsed = max((now - since).total_seconds(), 0)
+    return connection.score * 0.5 ** (elapsed / SCORE_HALF_LIFE_SECONDS)
+
+
+def merge_connection_pairs(apps, schema_editor):
+    Connection = apps.get_model('account', 'Connection')
+    groups = {}
+
+    for connection in Connection.objects.all().iterator():
+        a, b = connection.user1_id, connection.user2_id
+        key = (a, b) if str(a) < str(b) else (b, a)
+        groups.setdefault(key, []).append(connection)
+
+    now = timezone.now()
+
+    for (user1_id, user2_id), rows in groups.items():
+        if len(rows) == 1 and rows[0].user1_id == user1_id:
+            continue
+
+        # Keep the row already stored in order, if there is one
+        rows.sort(key=lambda row: row.user1_id != user1_id)
+        keeper, duplicates = rows[0], rows[1:]
+
+        if duplicates:
+            Connection.objects.filter(pk__in=[row.pk for row in duplicates]).delete()
+
+            interactions = [row.last_interaction for row in rows if row.last_interaction]
+            keeper.score = sum(_decayed(row, now) for row in rows)
+            keeper.decayed_at = now
+            keeper.last_interaction = max(interactions) if interactions else None
+            # Promotion to friends is left to the next interaction
+            keeper.is_connected = any(row.is_connected for row in rows)
+
+        keeper.user1_id, keeper.user2_id = user1_id, user2_id
+        keeper.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0009_connection_decayed_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_connection_pairs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='connection',
+            constraint=models.CheckConstraint(check=models.Q(('user1__lt', models.F('user2'))), name='connection_ordered_pair'),
+        ),
+    ]
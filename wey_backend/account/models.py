@@ -1,4 +1,5 @@
 import uuid
+from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, UserManager
@@ -62,6 +63,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     # prompt for it instead of leaving it None and causing a DB NOT NULL error
     REQUIRED_FIELDS = ['name']
 
+    COUNTER_FIELDS = ('friends_count', 'posts_count')
+
     def get_avatar(self):
         if self.avatar:
             return self.avatar.url
@@ -69,7 +72,15 @@ class User(AbstractBaseUser, PermissionsMixin):
             return 'https://picsum.photos/200/200'
     
     def save(self, *args, **kwargs):
-        self.friends_count = self.friends.count()
+        # Counters are kept up to date with F() updates (friends_count in
+        # signals.py, posts_count in post/api.py), so saving a loaded user
+        # must not write back its possibly stale copy
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+
         super().save(*args, **kwargs)
 
 
@@ -93,24 +104,79 @@ class FriendshipRequest(models.Model):
     def __str__(self):
         return f"{self.created_by.name} -> {self.created_for.name}"
 
+# Score above which two users are promoted to friends
+FRIENDSHIP_THRESHOLD = 15
+
+# A connection's score halves after this long without interaction
+SCORE_HALF_LIFE = timedelta(days=30)
+
+
+def decay_score(score, since, now=None):
+    if since is None:
+        return score
+
+    now = now or timezone.now()
+    elapsed = max((now - since).total_seconds(), 0)
+
+    return score * 0.5 ** (elapsed / SCORE_HALF_LIFE.total_seconds())
+
+
+def ordered_pair(a, b):
+    """
+    The (user1, user2) key a Connection is stored under: the smaller id first.
+    """
+    return (a, b) if str(a) < str(b) else (b, a)
+
+
+class ConnectionQuerySet(models.QuerySet):
+    def get_or_create_pair(self, user_a_id, user_b_id, defaults=None):
+        """
+        The Connection of two users, in either order: one point lookup on the
+        (user1, user2) unique index, creating the row if it is missing.
+        """
+        user1_id, user2_id = ordered_pair(user_a_id, user_b_id)
+
+        try:
+            return self.get_or_create(user1_id=user1_id, user2_id=user2_id, defaults=defaults)
+        except IntegrityError:
+            # A concurrent insert of the same pair won; read its row
+            connection = self.filter(user1_id=user1_id, user2_id=user2_id).first()
+
+            if connection is None:
+                raise
+
+            return connection, False
+
+
 class Connection(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user1 = models.ForeignKey(User, related_name='connections1', on_delete=models.CASCADE)
     user2 = models.ForeignKey(User, related_name='connections2', on_delete=models.CASCADE)
     score = models.FloatField(default=0)
     last_interaction = models.DateTimeField(null=True, blank=True)
+    # When `score` was last brought up to date; decay runs from here
+    decayed_at = models.DateTimeField(null=True, blank=True)
     is_connected = models.BooleanField(default=False, blank=True)
 
+    objects = ConnectionQuerySet.as_manager()
+
+    def decayed_score(self, now=None):
+        return decay_score(self.score, self.decayed_at or self.last_interaction, now)
+
+    def add_interaction(self, points, now=None):
+        now = now or timezone.now()
+        self.score = self.decayed_score(now) + points
+        self.last_interaction = now
+        self.decayed_at = now
+
     def save(self, *args, **kwargs):
-        if self.user1 == self.user2: raise IntegrityError("UNIQUE constraint failed")
-        if self.score > 15:
+        if self.user1_id == self.user2_id: raise IntegrityError("UNIQUE constraint failed")
+        self.user1_id, self.user2_id = ordered_pair(self.user1_id, self.user2_id)
+        if self.score > FRIENDSHIP_THRESHOLD:
             self.is_connected = True
             
+            # Symmetrical, so this adds both directions
             self.user1.friends.add(self.user2)
-            self.user2.friends.add(self.user1)
-
-            self.user1.save()
-            self.user2.save()
 
         else:
             self.is_connected = False
@@ -120,4 +186,8 @@ class Connection(models.Model):
         return f"{self.user1.name} - {self.user2.name}"
     
     class Meta:
-        unique_together = ('user1', 'user2')
\ No newline at end of file
+        unique_together = ('user1', 'user2')
+        constraints = [
+            # One row per pair: user1 is always the smaller id
+            models.CheckConstraint(check=Q(user1__lt=models.F('user2')), name='connection_ordered_pair'),
+        ]
\ No newline at end of file
@@ -0,0 +1,87 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from wey_backend.cache import invalidate
+
+from .graph import graph
+from .models import Connection, User
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    invalidate('profile', str(instance.pk))
+
+
+@receiver(m2m_changed, sender=User.friends.through)
+def invalidate_friendship_caches(sender, instance, action, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    # pk_set is None on post_clear; update_friends_count stashed the
+    # removed ids on pre_clear and only pops them after this handler
+    user_ids = {instance.pk, *(pk_set or instance.__dict__.get('_removed_friend_ids', ()))}
+
+    def invalidate_users():
+        for pk in user_ids:
+            invalidate('profile', str(pk))
+            invalidate('suggestions', str(pk))
+
+    # friends_count is updated later in the same transaction; invalidating
+    # before it commits lets a concurrent read cache the old count again
+    transaction.on_commit(invalidate_users)
+
+
+@receiver(m2m_changed, sender=User.friends.through)
+def update_friends_count(sender, instance, action, pk_set, **kwargs):
+    # Runs inside the m2m write's transaction. Django sends one signal per
+    # add/remove for the symmetrical relation; pk_set on post_add holds only
+    # the rows actually inserted, removals are resolved before the delete.
+    if action == 'pre_remove':
+        instance._removed_friend_ids = set(
+            sender.objects.filter(from_user_id=instance.pk, to_user_id__in=pk_set).values_list('to_user_id', flat=True)
+        )
+        return
+
+    if action == 'pre_clear':
+        instance._removed_friend_ids = set(instance.friends.values_list('id', flat=True))
+        return
+
+    if action == 'post_add':
+        changed, delta = pk_set, 1
+    elif action in ('post_remove', 'post_clear'):
+        changed, delta = instance.__dict__.pop('_removed_friend_ids', set()), -1
+    else:
+        return
+
+    if not changed:
+        return
+
+    User.objects.filter(pk=instance.pk).update(friends_count=F('friends_count') + delta * len(changed))
+    User.objects.filter(pk__in=changed).update(friends_count=F('friends_count') + delta)
+
+
+@receiver(m2m_changed, sender=User.friends.through)
+def update_graph_on_friendship_change(sender, instance, action, pk_set, **kwargs):
+    if action == 'post_add':
+        for pk in pk_set:
+            graph.set_edge(instance.pk, pk)
+    elif action == 'post_remove':
+        for pk in pk_set:
+            graph.remove_edge(instance.pk, pk)
+    elif action == 'pre_clear':
+        for pk in instance.friends.values_list('id', flat=True):
+            graph.remove_edge(instance.pk, pk)
+
+
+@receiver(post_save, sender=Connection)
+def update_graph_on_connection_save(sender, instance, **kwargs):
+    # Promotion to friends already added the edge through m2m_changed
+    graph.update_weight(instance.user1_id, instance.user2_id, instance.decayed_score())
+
+
+@receiver(m2m_changed, sender=User.people_you_may_know.through)
+def invalidate_suggestions_cache(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate('suggestions', str(instance.pk))
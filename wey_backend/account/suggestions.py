@@ -0,0 +1,146 @@
+import bisect
+
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+from django.utils import timezone
+
+from wey_backend.cache import invalidate
+from wey_backend.jobs import Job
+
+from .models import Connection, User, decay_score
+
+
+SUGGESTIONS_PER_USER = 20
+
+# Rows of the friendship matrix multiplied per step
+CHUNK_SIZE = 1000
+
+
+def load_matrices(user_ids=None):
+    """
+    Friendship adjacency A and decayed Connection.score matrix W over dense int ids.
+    """
+    if user_ids is None:
+        user_ids = list(User.objects.values_list('id', flat=True))
+
+    index = {user_id: i for i, user_id in enumerate(user_ids)}
+    size = len(user_ids)
+
+    rows, cols = [], []
+
+    for a, b in User.friends.through.objects.values_list('from_user_id', 'to_user_id').iterator():
+        if a in index and b in index:
+            rows.append(index[a])
+            cols.append(index[b])
+
+    friends = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(size, size))
+    # The self-referential m2m stores both directions; clamp duplicates to 1
+    friends.data[:] = 1
+
+    rows, cols, scores = [], [], []
+    now = timezone.now()
+    connections = Connection.objects.values_list('user1_id', 'user2_id', 'score', 'decayed_at', 'last_interaction')
+
+    for a, b, score, decayed_at, last_interaction in connections.iterator():
+        if a in index and b in index:
+            score = decay_score(score, decayed_at or last_interaction, now)
+            rows += [index[a], index[b]]
+            cols += [index[b], index[a]]
+            scores += [score, score]
+
+    weights = sparse.csr_matrix((np.array(scores, dtype=np.float32), (rows, cols)), shape=(size, size))
+
+    return user_ids, friends, weights
+
+
+def rank_suggestions(friends, weights, start, end, limit=SUGGESTIONS_PER_USER):
+    """
+    Top candidates for rows start..end: friends of friends who are not
+    already friends, scored by mutual friends plus Connection.score.
+    Returns {row: [column, ...]} best first.
+    """
+    block = friends[start:end]
+    mutual = (block @ friends).tocsr()
+
+    # Drop existing friends and the users themselves
+    rows = np.arange(end - start)
+    own = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, rows + start)), shape=block.shape)
+    mutual = (mutual - mutual.multiply(block) - mutual.multiply(own)).tocsr()
+    mutual.eliminate_zeros()
+
+    candidates = mutual.copy()
+    candidates.data[:] = 1
+    scores = (mutual + candidates.multiply(weights[start:end])).tocsr()
+
+    result = {}
+
+    for i in range(end - start):
+        row_start, row_end = scores.indptr[i], scores.indptr[i + 1]
+
+        if row_start == row_end:
+            continue
+
+        columns = scores.indices[row_start:row_end]
+        values = scores.data[row_start:row_end]
+        best = np.argsort(-values, kind='stable')[:limit]
+        result[start + i] = columns[best].tolist()
+
+    return result
+
+
+class FriendSuggestionsJob(Job):
+    name = 'friend_suggestions'
+
+    def __init__(self, limit=SUGGESTIONS_PER_USER, chunk_size=CHUNK_SIZE):
+        self.limit = limit
+        self.chunk_size = chunk_size
+
+    def prepare(self):
+        user_ids = sorted(User.objects.values_list('id', flat=True), key=str)
+        self.user_ids, self.friends, self.weights = load_matrices(user_ids)
+        self.keys = [str(user_id) for user_id in self.user_ids]
+
+    def shards(self):
+        # Ranges of user ids, so a resumed run maps shards to the same users
+        return [
+            [self.keys[start], self.keys[min(start + self.chunk_size, len(self.keys)) - 1]]
+            for start in range(0, len(self.keys), self.chunk_size)
+        ]
+
+    def run_shard(self, shard):
+        start = bisect.bisect_left(self.keys, shard[0])
+        end = bisect.bisect_right(self.keys, shard[1])
+
+        return [
+            [self.keys[row], self.keys[column]]
+            for row, columns in rank_suggestions(self.friends, self.weights, start, end, self.limit).items()
+            for column in columns
+        ]
+
+    def finish(self, results):
+        suggested = {key: set() for key in self.keys}
+
+        for rows in results:
+            for a, b in rows:
+                # people_you_may_know is symmetrical, store both directions
+                suggested[a].add(b)
+                suggested[b].add(a)
+
+        Through = User.people_you_may_know.through
+
+        # One short transaction per chunk of users rather than one over the
+        # whole table; each user sees either their old or new suggestions
+        for start in range(0, len(self.keys), self.chunk_size):
+            keys = self.keys[start:start + self.chunk_size]
+
+            with transaction.atomic():
+                Through.objects.filter(from_user_id__in=keys).delete()
+                Through.objects.bulk_create([
+                    Through(from_user_id=a, to_user_id=b) for a in keys for b in suggested[a]
+                ], batch_size=1000)
+
+        invalidate('suggestions')
+
+        self.stored = sum(len(users) for users in suggested.values()) // 2
@@ -1,3 +1,172 @@
-from django.test import TestCase
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from . import interactions
+from .interactions import InteractionBuffer, MAX_ATTEMPTS, apply_interactions
+from .models import Connection, FriendshipRequest, User, ordered_pair
+
+
+@override_settings(CONNECTION_BUFFER_FLUSH_INTERVAL=0)
+class InteractionBufferTest(TestCase):
+    def setUp(self):
+        self.alice, self.bob, self.carol = [
+            User.objects.create_user(name=name, email=f'{name}@example.com', password='pass')
+            for name in ('alice', 'bob', 'carol')
+        ]
+        self.buffer = InteractionBuffer()
+        self.now = timezone.now()
+
+    def self_pair(self, user):
+        # Breaks the connection_ordered_pair check, so the write always fails
+        return (user.id, user.id)
+
+    def test_increments_are_coalesced_per_pair(self):
+        batch = self.buffer.new_batch()
+        pair = ordered_pair(self.alice.id, self.bob.id)
+        self.buffer.collect(batch, (pair, 1, self.now, 0))
+        self.buffer.collect(batch, (pair, 2, self.now, 0))
+
+        self.assertEqual(batch, {pair: [3, self.now, 0]})
+
+    def test_record_writes_the_connection(self):
+        self.buffer.record(self.bob.id, self.alice.id, 2, self.now)
+        self.buffer.record(self.alice.id, self.bob.id, 1, self.now)
+
+        connection, created = Connection.objects.get_or_create_pair(self.alice.id, self.bob.id)
+        self.assertFalse(created)
+        self.assertAlmostEqual(connection.score, 3)
+
+    def test_pair_resolves_to_one_row_in_either_order(self):
+        forward, created = Connection.objects.get_or_create_pair(self.alice.id, self.bob.id)
+        backward, created_again = Connection.objects.get_or_create_pair(self.bob.id, self.alice.id)
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(forward.pk, backward.pk)
+        self.assertEqual(Connection.objects.count(), 1)
+
+    def test_only_failed_pairs_are_retried(self):
+        good = ordered_pair(self.alice.id, self.bob.id)
+        bad = self.self_pair(self.carol)
+
+        with self.assertLogs('account.interactions', 'WARNING'):
+            retry = apply_interactions({good: [1, self.now, 0], bad: [1, self.now, 0]})
+
+        self.assertEqual(retry, {bad: [1, self.now, 1]})
+        self.assertEqual(Connection.objects.count(), 1)
+
+    def test_pairs_are_dropped_after_max_attempts(self):
+        bad = self.self_pair(self.carol)
+
+        with self.assertLogs('account.interactions', 'ERROR'):
+            retry = apply_interactions({bad: [1, self.now, MAX_ATTEMPTS - 1]})
+
+        self.assertEqual(retry, {})
+
+    def test_pairs_of_deleted_users_are_dropped(self):
+        ghost = uuid.uuid4()
+
+        retry = apply_interactions({ordered_pair(ghost, self.alice.id): [1, self.now, 0]})
+
+        self.assertEqual(retry, {})
+        self.assertFalse(Connection.objects.exists())
+
+    def test_deadlocks_are_retried(self):
+        pair = ordered_pair(self.alice.id, self.bob.id)
+
+        deadlock = OperationalError('deadlock')
+
+        with mock.patch.object(interactions, '_write_batch', side_effect=deadlock), \
+                mock.patch.object(interactions, '_write_pair', side_effect=deadlock), \
+                self.assertLogs('account.interactions', 'WARNING'):
+            retry = apply_interactions({pair: [1, self.now, 0]})
+
+        self.assertEqual(retry, {pair: [1, self.now, 1]})
+
+    def test_failing_pair_does_not_loop(self):
+        # With eager flushing a retry flushes again right away
+        with self.assertLogs('account.interactions', 'ERROR'):
+            self.buffer.add((self.self_pair(self.carol), 1, self.now, 0))
+            self.buffer.record(uuid.uuid4(), self.bob.id, 1, self.now)
+
+        self.assertEqual(self.buffer._pending, {})
+        self.assertFalse(Connection.objects.exists())
+
+
+@override_settings(NOTIFICATION_DISPATCH_INTERVAL=0)
+class FriendsCountCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(name='alice', email='alice@example.com', password='pass')
+        self.bob = User.objects.create_user(name='bob', email='bob@example.com', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def profile_friends_count(self, user):
+        return self.client.get(f'/api/posts/profile/{user.id}/').json()['user']['friends_count']
+
+    def test_cached_profile_follows_friends_count(self):
+        FriendshipRequest.objects.create(created_for=self.alice, created_by=self.bob)
+        self.assertEqual(self.profile_friends_count(self.bob), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/friends/{self.bob.id}/accepted/')
+
+        self.assertEqual(self.profile_friends_count(self.bob), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/friends/{self.bob.id}/remove/')
+
+        self.assertEqual(self.profile_friends_count(self.bob), 0)
+
+
+class ConnectionPairMigrationTest(TransactionTestCase):
+    migrate_from = ('account', '0009_connection_decayed_at')
+    migrate_to = ('account', '0010_connection_ordered_pair')
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([target])
+        return executor.loader.project_state(target).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_reversed_duplicates_are_merged(self):
+        alice, bob, carol = [
+            User.objects.create_user(name=name, email=f'{name}@example.com', password='pass')
+            for name in ('alice', 'bob', 'carol')
+        ]
+        now = timezone.now()
+
+        apps = self.migrate(self.migrate_from)
+        OldConnection = apps.get_model('account', 'Connection')
+
+        ab = ordered_pair(alice.id, bob.id)
+        ac = ordered_pair(alice.id, carol.id)
+        OldConnection.objects.create(user1_id=ab[0], user2_id=ab[1], score=4, decayed_at=now)
+        OldConnection.objects.create(user1_id=ab[1], user2_id=ab[0], score=6, decayed_at=now, is_connected=True)
+        reversed_only = OldConnection.objects.create(user1_id=ac[1], user2_id=ac[0], score=2, decayed_at=now)
+
+        apps = self.migrate(self.migrate_to)
+        Connection = apps.get_model('account', 'Connection')
+
+        self.assertEqual(Connection.objects.count(), 2)
+
+        merged = Connection.objects.get(user1_id=ab[0], user2_id=ab[1])
+        self.assertAlmostEqual(merged.score, 10, places=3)
+        self.assertTrue(merged.is_connected)
+
+        # A lone reversed row is flipped in place
+        flipped = Connection.objects.get(pk=reversed_only.pk)
+        self.assertEqual((flipped.user1_id, flipped.user2_id), ac)
+        self.assertEqual(flipped.score, 2)
@@ -1,13 +1,43 @@
+from django.db import transaction
+from django.db.models import Count, Q
 from django.http import JsonResponse
 
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
-from django.db.models import Q
-from datetime import datetime
 
-from account.models import User, Connection
+from account import interactions
+from account.models import User
+from account.serializers import UserSerializer
+from post.pagination import InvalidCursor, paginate_newest_first
 
 from .models import Conversation, ConversationMessage
-from .serializers import ConversationSerializer, ConversationDetailSerializer, ConversationMessageSerializer
+from .serializers import ConversationSerializer, ConversationDetailSerializer, ConversationMessageSerializer, ConversationMessageRowSerializer
+
+
+# Messages per page of history
+MESSAGES_PAGE_SIZE = 50
+MAX_MESSAGES_PAGE_SIZE = 100
+
+
+def conversation_history(conversation, request):
+    """
+    The newest page of messages, or the page before the `before` cursor,
+    oldest first. Messages carry user ids; each user appears once in `users`.
+    """
+    messages, next_cursor = paginate_newest_first(
+        conversation.messages.all(), request, cursor_param='before',
+        default=MESSAGES_PAGE_SIZE, maximum=MAX_MESSAGES_PAGE_SIZE,
+    )
+    messages.reverse()
+
+    user_ids = {user_id for message in messages for user_id in (message.created_by_id, message.sent_to_id)}
+    users = User.objects.filter(Q(id__in=user_ids) | Q(conversations=conversation)).distinct()
+
+    return {
+        **ConversationDetailSerializer(conversation).data,
+        'users': {str(user.id): UserSerializer(user).data for user in users},
+        'messages': ConversationMessageRowSerializer(messages, many=True).data,
+        'next': next_cursor,
+    }
 
 
 @api_view(['GET'])
@@ -18,12 +48,62 @@ def conversation_list(request):
     return JsonResponse(serializer.data, safe=False)
 
 
+@api_view(['GET'])
+def conversation_inbox(request):
+    """
+    The user's conversations, most recently active first, each with the
+    other participant, the last message and the unread count. Three
+    queries per page however many conversations there are.
+    """
+    conversations = Conversation.objects.filter(users=request.user).select_related('last_message')
+
+    try:
+        conversations, next_cursor = paginate_newest_first(conversations, request, field='modified_at')
+    except InvalidCursor:
+        return JsonResponse({'error': 'invalid cursor'}, status=400)
+
+    ids = [conversation.id for conversation in conversations]
+
+    others = {
+        member.conversation_id: member.user
+        for member in Conversation.users.through.objects.filter(conversation_id__in=ids)
+        .exclude(user=request.user).select_related('user')
+    }
+    unread = dict(
+        ConversationMessage.objects.filter(sent_to=request.user, is_read=False, conversation_id__in=ids)
+        .values_list('conversation_id').annotate(count=Count('id'))
+    )
+
+    results = []
+
+    for conversation in conversations:
+        other = others.get(conversation.id)
+        last_message = conversation.last_message
+
+        results.append({
+            **ConversationDetailSerializer(conversation).data,
+            'other_user': UserSerializer(other).data if other else None,
+            'last_message': ConversationMessageRowSerializer(last_message).data if last_message else None,
+            'unread_count': unread.get(conversation.id, 0),
+        })
+
+    return JsonResponse({'results': results, 'next': next_cursor})
+
+
 @api_view(['GET'])
 def conversation_detail(request, pk):
     conversation = Conversation.objects.filter(users__in=list([request.user])).get(pk=pk)
-    serializer = ConversationDetailSerializer(conversation)
 
-    return JsonResponse(serializer.data, safe=False)
+    try:
+        data = conversation_history(conversation, request)
+    except InvalidCursor:
+        return JsonResponse({'error': 'invalid cursor'}, status=400)
+
+    if not request.GET.get('before'):
+        # Opening the conversation reads everything sent to this user
+        conversation.messages.filter(sent_to=request.user, is_read=False).update(is_read=True)
+
+    return JsonResponse(data, safe=False)
 
 
 @api_view(['GET'])
@@ -39,9 +119,12 @@ def conversation_get_or_create(request, user_pk):
         conversation.users.add(user, request.user)
         conversation.save()
 
-    serializer = ConversationDetailSerializer(conversation)
-    
-    return JsonResponse(serializer.data, safe=False)
+    try:
+        data = conversation_history(conversation, request)
+    except InvalidCursor:
+        return JsonResponse({'error': 'invalid cursor'}, status=400)
+
+    return JsonResponse(data, safe=False)
 
 
 @api_view(['POST'])
@@ -52,30 +135,19 @@ def conversation_send_message(request, pk):
         if user != request.user:
             sent_to = user
 
-    conversation_message = ConversationMessage.objects.create(
-        conversation=conversation,
-        body=request.data.get('body'),
-        created_by=request.user,
-        sent_to=sent_to
-    )
-
-    conversation_message.save()
-
-    try:
-        # Update connections object
-        connection_obj = Connection.objects.filter(Q(user1=request.user, user2=sent_to) | 
-                                                Q(user1=sent_to, user2=request.user)).first()
-        
-        if connection_obj is None:
-            connection_obj = Connection.objects.create(user1=request.user, user2=sent_to,
-                                    score=2, last_interaction=datetime.now())
-
-        connection_obj.score += 2
-        connection_obj.last_interaction = datetime.now()
-
-        connection_obj.save()
-    except Exception as e:
-        print(e)
+    with transaction.atomic():
+        conversation_message = ConversationMessage.objects.create(
+            conversation=conversation,
+            body=request.data.get('body'),
+            created_by=request.user,
+            sent_to=sent_to
+        )
+        Conversation.objects.filter(pk=conversation.pk).update(
+            last_message=conversation_message,
+            modified_at=conversation_message.created_at,
+        )
+
+    interactions.record(request.user.id, sent_to.id, interactions.MESSAGE_POINTS)
 
     serializer = ConversationMessageSerializer(conversation_message)
 
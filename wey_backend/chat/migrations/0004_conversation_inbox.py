@@ -0,0 +1,50 @@
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def set_last_messages(apps, schema_editor):
+    Conversation = apps.get_model('chat', 'Conversation')
+    ConversationMessage = apps.get_model('chat', 'ConversationMessage')
+
+    latest = ConversationMessage.objects.filter(conversation=OuterRef('pk')).order_by('-created_at', '-id')
+    Conversation.objects.update(
+        last_message=Subquery(latest.values('pk')[:1]),
+        modified_at=Coalesce(Subquery(latest.values('created_at')[:1]), F('modified_at')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_conversationmessage_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.conversationmessage'),
+        ),
+        # Existing messages count as read; new ones start unread
+        migrations.AddField(
+            model_name='conversationmessage',
+            name='is_read',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='conversationmessage',
+            name='is_read',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(set_last_messages, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['-modified_at', '-id'], name='conversation_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversationmessage',
+            index=models.Index(fields=['sent_to', 'is_read', 'conversation'], name='message_unread_idx'),
+        ),
+    ]
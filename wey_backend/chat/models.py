@@ -10,10 +10,17 @@ class Conversation(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     users = models.ManyToManyField(User, related_name='conversations')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped with last_message on every send, so the inbox sorts by activity
     modified_at = models.DateTimeField(auto_now=True)
+    last_message = models.ForeignKey('ConversationMessage', related_name='+', on_delete=models.SET_NULL, blank=True, null=True)
     
     def modified_at_formatted(self):
-       return timesince(self.created_at)
+       return timesince(self.modified_at)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-modified_at', '-id'], name='conversation_modified_idx'),
+        ]
 
 
 class ConversationMessage(models.Model):
@@ -23,9 +30,18 @@ class ConversationMessage(models.Model):
     sent_to = models.ForeignKey(User, related_name='received_messages', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(User, related_name='sent_messages', on_delete=models.CASCADE)
+    is_read = models.BooleanField(default=False)
     
     def created_at_formatted(self):
        return timesince(self.created_at)
 
     def __str__(self):
-        return f"{self.created_by} -> {self.sent_to}"
\ No newline at end of file
+        return f"{self.created_by} -> {self.sent_to}"
+
+    class Meta:
+        indexes = [
+            # Message history is read newest first, one conversation at a time
+            models.Index(fields=['conversation', '-created_at', '-id'], name='message_conv_created_idx'),
+            # Per-conversation unread counts for the inbox
+            models.Index(fields=['sent_to', 'is_read', 'conversation'], name='message_unread_idx'),
+        ]
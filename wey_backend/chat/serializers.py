@@ -22,10 +22,18 @@ class ConversationMessageSerializer(serializers.ModelSerializer):
         fields = ('id', 'sent_to', 'created_by', 'created_at_formatted', 'body',)
 
 
-class ConversationDetailSerializer(serializers.ModelSerializer):
-    messages = ConversationMessageSerializer(read_only=True, many=True)
+class ConversationMessageRowSerializer(serializers.ModelSerializer):
+    # Users are sent once per page, in the response's `users` dict
+    sent_to = serializers.UUIDField(source='sent_to_id', read_only=True)
+    created_by = serializers.UUIDField(source='created_by_id', read_only=True)
 
+    class Meta:
+        model = ConversationMessage
+        fields = ('id', 'sent_to', 'created_by', 'created_at_formatted', 'body',)
+
+
+class ConversationDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Conversation
-        fields = ('id', 'users', 'modified_at_formatted', 'messages',)
+        fields = ('id', 'modified_at_formatted',)
 
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from wey_backend.pubsub import publish, user_channel
+
+from .models import ConversationMessage
+from .serializers import ConversationMessageRowSerializer
+
+
+def push_message(message):
+    event = {
+        'type': 'chat.message',
+        'conversation': str(message.conversation_id),
+        'message': ConversationMessageRowSerializer(message).data,
+    }
+
+    for user_id in {message.created_by_id, message.sent_to_id}:
+        publish(user_channel(user_id), event)
+
+
+@receiver(post_save, sender=ConversationMessage)
+def push_message_on_create(sender, instance, created, **kwargs):
+    # Only once the row is visible to a client that re-fetches the history
+    if created:
+        transaction.on_commit(lambda: push_message(instance))
@@ -1,3 +1,61 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.test import TransactionTestCase, override_settings
+
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.models import User
+from wey_backend.realtime import CLOSE_UNAUTHORIZED, websocket_application
+
+from .models import Conversation
+
+
+# Messages are pushed on commit, so these tests need real transactions
+@override_settings(CONNECTION_BUFFER_FLUSH_INTERVAL=0, NOTIFICATION_DISPATCH_INTERVAL=0)
+class WebSocketTest(TransactionTestCase):
+    def setUp(self):
+        self.sender = User.objects.create_user(name='Sender', email='sender@example.com', password='pass')
+        self.recipient = User.objects.create_user(name='Recipient', email='recipient@example.com', password='pass')
+        self.conversation = Conversation.objects.create()
+        self.conversation.users.add(self.sender, self.recipient)
+
+    def connect(self, query_string=b''):
+        return ApplicationCommunicator(websocket_application, {
+            'type': 'websocket',
+            'path': '/ws/',
+            'query_string': query_string,
+            'headers': [],
+        })
+
+    def send_message(self, body):
+        client = APIClient()
+        client.force_authenticate(self.sender)
+        response = client.post(f'/api/chat/{self.conversation.id}/send/', {'body': body})
+        self.assertEqual(response.status_code, 200)
+
+    async def test_connection_without_a_valid_token_is_rejected(self):
+        for query_string in (b'', b'token=not-a-jwt'):
+            communicator = self.connect(query_string)
+            await communicator.send_input({'type': 'websocket.connect'})
+
+            self.assertEqual(await communicator.receive_output(), {'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+
+    async def test_new_message_is_pushed_to_the_recipient(self):
+        token = await sync_to_async(AccessToken.for_user)(self.recipient)
+        communicator = self.connect(f'token={token}'.encode())
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual(await communicator.receive_output(), {'type': 'websocket.accept'})
+
+        await sync_to_async(self.send_message)('hello')
+        event = json.loads((await communicator.receive_output(timeout=5))['text'])
+
+        self.assertEqual(event['type'], 'chat.message')
+        self.assertEqual(event['conversation'], str(self.conversation.id))
+        self.assertEqual(event['message']['body'], 'hello')
+        self.assertEqual(event['message']['created_by'], str(self.sender.id))
+
+        await communicator.send_input({'type': 'websocket.disconnect'})
+        await communicator.wait()
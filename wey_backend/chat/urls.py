@@ -5,6 +5,7 @@ from . import api
 
 urlpatterns = [
     path('', api.conversation_list, name='conversation_list'),
+    path('inbox/', api.conversation_inbox, name='conversation_inbox'),
     path('<uuid:pk>/', api.conversation_detail, name='conversation_detail'),
     path('<uuid:pk>/send/', api.conversation_send_message, name='conversation_send_message'),
     path('<uuid:user_pk>/get-or-create/', api.conversation_get_or_create, name='conversation_get_or_create'),
@@ -1,17 +1,91 @@
-from django.http import JsonResponse
+from django.db.models import Count, Max, Q
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition
 
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 
+from post.pagination import InvalidCursor, decode_cursor, encode_cursor, paginate_newest_first
+
 from .models import Notification
 from .serializers import NotificationSerializer
 
 
+def unread_etag(request):
+    # Any new notification raises the newest timestamp and any read or
+    # deleted one lowers the count, so the pair changes with the list
+    stats = request.user.received_notifications.filter(is_read=False).aggregate(
+        count=Count('id'), latest=Max('created_at'),
+    )
+    latest = stats['latest'].timestamp() if stats['latest'] else 0
+
+    # Each page (cursor, page_size, since) of the list has its own ETag
+    return f'{stats["count"]}-{latest}-{request.GET.urlencode()}'
+
+
 @api_view(['GET'])
+@condition(etag_func=unread_etag)
 def notifications(request):
-    received_notifications = request.user.received_notifications.filter(is_read=False)
-    serializer = NotificationSerializer(received_notifications, many=True)
+    received_notifications = request.user.received_notifications.filter(is_read=False).select_related('created_by')
+
+    # ?since=<created_at of the newest notification the client has> returns
+    # only newer ones, or 304 when there are none
+    since = request.GET.get('since')
+
+    if since:
+        since = parse_datetime(since)
+
+        if since is None:
+            return JsonResponse({'error': 'invalid since'}, status=400)
+
+        received_notifications = received_notifications.filter(created_at__gt=since)
+
+        if not received_notifications.exists():
+            return HttpResponseNotModified()
+
+    try:
+        rows, next_cursor = paginate_newest_first(received_notifications, request)
+    except InvalidCursor:
+        return JsonResponse({'error': 'invalid cursor'}, status=400)
+
+    serializer = NotificationSerializer(rows, many=True)
+
+    return JsonResponse({
+        'results': serializer.data,
+        'next': next_cursor,
+        # Pass back as up_to to mark everything up to this page's newest row read
+        'latest': encode_cursor(rows[0].created_at, rows[0].id) if rows else None,
+    })
+
+
+@api_view(['GET'])
+def unread_count(request):
+    # Counted from the (created_for, is_read, created_at) index alone
+    count = request.user.received_notifications.filter(is_read=False).count()
+
+    return JsonResponse({'count': count})
+
+
+@api_view(['POST'])
+def read_notifications(request):
+    """
+    Marks the user's unread notifications read in one UPDATE: all of them,
+    or with up_to=<cursor> only those at or before that cursor.
+    """
+    unread = request.user.received_notifications.filter(is_read=False)
+    up_to = request.data.get('up_to')
+
+    if up_to:
+        try:
+            created_at, pk = decode_cursor(up_to)
+        except InvalidCursor:
+            return JsonResponse({'error': 'invalid cursor'}, status=400)
+
+        unread = unread.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lte=pk))
+
+    updated = unread.update(is_read=True)
 
-    return JsonResponse(serializer.data, safe=False)
+    return JsonResponse({'message': 'notifications read', 'count': updated})
 
 
 @api_view(['POST'])
@@ -20,4 +94,4 @@ def read_notification(request, pk):
     notification.is_read = True
     notification.save()
 
-    return JsonResponse({'message': 'notification read'})
\ No newline at end of file
+    return JsonResponse({'message': 'notification read'})
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0002_alter_notification_type_of_notification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_for', 'is_read', '-created_at'], name='notification_unread_idx'),
+        ),
+    ]
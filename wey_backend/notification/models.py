@@ -28,4 +28,10 @@ class Notification(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, blank=True, null=True)
     created_by = models.ForeignKey(User, related_name='created_notifications', on_delete=models.CASCADE)
     created_for = models.ForeignKey(User, related_name='received_notifications', on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Unread list, unread count and the list's ETag all read this range
+            models.Index(fields=['created_for', 'is_read', '-created_at'], name='notification_unread_idx'),
+        ]
@@ -10,4 +10,4 @@ class NotificationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Notification
-        fields = ('id', 'body', 'type_of_notification', 'post_id', 'created_for_id', 'created_by')
\ No newline at end of file
+        fields = ('id', 'body', 'type_of_notification', 'post_id', 'created_for_id', 'created_by', 'created_at')
\ No newline at end of file
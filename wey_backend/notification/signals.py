@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from wey_backend.pubsub import publish, user_channel
+
+from .models import Notification
+from .serializers import NotificationSerializer
+
+
+def push_notification(notification):
+    publish(user_channel(notification.created_for_id), {
+        'type': 'notification',
+        'notification': NotificationSerializer(notification).data,
+    })
+
+
+@receiver(post_save, sender=Notification)
+def push_notification_on_create(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: push_notification(instance))
@@ -1,3 +1,63 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from account.models import User
+from post.models import Post
+
+from .models import Notification
+from .utils import NotificationDispatcher, build_notifications, create_notification
+
+
+class NotificationDispatchTest(TestCase):
+    def setUp(self):
+        self.author, self.ann, self.bob = [
+            User.objects.create_user(name=name, email=f'{name.lower()}@example.com', password='pass')
+            for name in ('Author', 'Ann', 'Bob')
+        ]
+        self.post = Post.objects.create(body='hello', created_by=self.author)
+
+    def test_likes_on_one_post_are_coalesced(self):
+        notifications = build_notifications([
+            (Notification.POST_LIKE, self.ann, self.author.pk, self.post.pk),
+            (Notification.POST_LIKE, self.bob, self.author.pk, self.post.pk),
+            (Notification.POST_LIKE, self.ann, self.author.pk, self.post.pk),
+        ])
+
+        self.assertEqual(len(notifications), 1)
+        self.assertEqual(notifications[0].body, 'Ann and 1 other liked one of your posts!')
+        self.assertEqual(notifications[0].created_by, self.ann)
+
+    def test_friend_requests_are_not_coalesced(self):
+        notifications = build_notifications([
+            (Notification.NEWFRIENDREQUEST, self.ann, self.author.pk, None),
+            (Notification.NEWFRIENDREQUEST, self.bob, self.author.pk, None),
+        ])
+
+        self.assertEqual([n.body for n in notifications], [
+            'Ann sent you a friend request!',
+            'Bob sent you a friend request!',
+        ])
+
+    @override_settings(NOTIFICATION_DISPATCH_INTERVAL=60)
+    def test_queued_notifications_are_written_and_pushed_on_flush(self):
+        dispatcher = NotificationDispatcher()
+        self.addCleanup(lambda: dispatcher._timer and dispatcher._timer.cancel())
+
+        dispatcher.add((Notification.POST_COMMENT, self.ann, self.author.pk, self.post.pk))
+        dispatcher.add((Notification.POST_COMMENT, self.bob, self.author.pk, self.post.pk))
+        self.assertFalse(Notification.objects.exists())
+
+        with mock.patch('notification.utils.push_notification') as push:
+            dispatcher.flush()
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.body, 'Bob and 1 other commented on one of your posts!')
+        self.assertEqual(notification.created_for, self.author)
+        push.assert_called_once_with(notification)
+
+    @override_settings(NOTIFICATION_DISPATCH_INTERVAL=0)
+    def test_create_notification_writes_immediately_without_an_interval(self):
+        create_notification(self.ann, self.author, Notification.NEWFRIENDREQUEST)
+
+        self.assertEqual(Notification.objects.get().created_by, self.ann)
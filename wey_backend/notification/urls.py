@@ -5,5 +5,7 @@ from . import api
 
 urlpatterns = [
     path('', api.notifications, name='notifications'),
+    path('unread-count/', api.unread_count, name='unread_count'),
+    path('read/', api.read_notifications, name='read_notifications'),
     path('read/<uuid:pk>/', api.read_notification, name='read_notification'),
 ]
\ No newline at end of file
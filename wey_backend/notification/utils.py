@@ -1,41 +1,85 @@
+from wey_backend.buffer import WriteBuffer
+
 from .models import Notification
+from .signals import push_notification
+
+
+BODIES = {
+    Notification.POST_LIKE: '{actor} liked one of your posts!',
+    Notification.POST_COMMENT: '{actor} commented on one of your posts!',
+    Notification.NEWFRIENDREQUEST: '{actor} sent you a friend request!',
+    Notification.ACCEPTEDFRIENDREQUEST: '{actor} accepted your friend request!',
+    Notification.REJECTEDFRIENDREQUEST: '{actor} rejected your friend request!',
+}
+
+# Several of these on the same post within one flush become a single
+# "Ann and 4 others liked one of your posts!"
+COALESCED_TYPES = (Notification.POST_LIKE, Notification.POST_COMMENT)
+
+
+def _actor_text(names):
+    if len(names) == 1:
+        return names[0]
+
+    others = len(names) - 1
+    return f'{names[-1]} and {others} other{"s" if others > 1 else ""}'
+
+
+def build_notifications(items):
+    """
+    Notification rows for queued (type, created_by, created_for_id, post_id)
+    items, with bursts on the same post merged into one row per recipient.
+    """
+    groups = {}
+
+    for n, (type_of_notification, created_by, created_for_id, post_id) in enumerate(items):
+        key = (type_of_notification, created_for_id, post_id)
+
+        if type_of_notification not in COALESCED_TYPES:
+            key += (n,)
+
+        groups.setdefault(key, []).append(created_by)
+
+    notifications = []
+
+    for (type_of_notification, created_for_id, post_id, *_), actors in groups.items():
+        # One mention per person, ordered by their latest action
+        actors = list({actor.id: actor for actor in reversed(actors)}.values())[::-1]
+
+        notifications.append(Notification(
+            body=BODIES[type_of_notification].format(actor=_actor_text([actor.name for actor in actors])),
+            type_of_notification=type_of_notification,
+            created_by=actors[-1],
+            created_for_id=created_for_id,
+            post_id=post_id,
+        ))
+
+    return notifications
+
+
+class NotificationDispatcher(WriteBuffer):
+    """
+    Writes queued notifications with one bulk INSERT per flush and pushes
+    them to the recipients' sockets.
+    """
+
+    interval_setting = 'NOTIFICATION_DISPATCH_INTERVAL'
+    default_interval = 2
+
+    def write(self, batch):
+        notifications = Notification.objects.bulk_create(build_notifications(batch))
+
+        # bulk_create doesn't send post_save, so push here
+        for notification in notifications:
+            push_notification(notification)
+
+
+dispatcher = NotificationDispatcher()
+
 
-from post.models import Post
-from account.models import FriendshipRequest
-
-# create_notification(request, 'post_like', 'lskjf-j12l3-jlas-jdfa', 'lskjf-j12l3-jlas-jdfa')
-
-
-def create_notification(request, type_of_notification, post_id=None, friendrequest_id=None):
-    created_for = None
-
-    if type_of_notification == 'post_like':
-        body = f'{request.user.name} liked one of your posts!'
-        post = Post.objects.get(pk=post_id)
-        created_for = post.created_by
-    elif type_of_notification == 'post_comment':
-        body = f'{request.user.name} commented on one of your posts!'
-        post = Post.objects.get(pk=post_id)
-        created_for = post.created_by
-    elif type_of_notification == 'new_friendrequest':
-        friendrequest = FriendshipRequest.objects.get(pk=friendrequest_id)
-        created_for = friendrequest.created_for
-        body = f'{request.user.name} sent you a friend request!'
-    elif type_of_notification == 'accepted_friendrequest':
-        friendrequest = FriendshipRequest.objects.get(pk=friendrequest_id)
-        created_for = friendrequest.created_for
-        body = f'{request.user.name} accepted your friend request!'
-    elif type_of_notification == 'rejected_friendrequest':
-        friendrequest = FriendshipRequest.objects.get(pk=friendrequest_id)
-        created_for = friendrequest.created_for
-        body = f'{request.user.name} rejected your friend request!'
-
-    notification = Notification.objects.create(
-        body=body,
-        type_of_notification=type_of_notification,
-        created_by=request.user,
-        post_id=post_id,
-        created_for=created_for
-    )
-
-    return notification
\ No newline at end of file
+def create_notification(created_by, created_for, type_of_notification, post_id=None):
+    """
+    Queues a notification for created_for. The caller resolves the
+    recipient; nothing is read or written during the request.
+    """
+    dispatcher.add((type_of_notification, created_by, created_for.pk, post_id))
@@ -1,35 +1,52 @@
-from datetime import datetime
-from django.db.models import Q
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 from django.http import JsonResponse
 
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from urllib3 import request
 
-from account.models import Connection, User, FriendshipRequest
+from account import interactions
+from account.models import User, FriendshipRequest
 from account.serializers import UserSerializer
 from notification.utils import create_notification
+from search.index import index_post
+from wey_backend.cache import get_or_compute, invalidate
 
 from .forms import PostForm, AttachmentForm
-from .models import Post, Like, Comment, Trend, PostAttachment
-from .serializers import PostSerializer, PostDetailSerializer, CommentSerializer, TrendSerializer
+from .models import Post, Like, Comment, Trend, PostAttachment, PostHashtag
+from .serializers import PostSerializer, PostDetailSerializer, CommentSerializer, TrendSerializer, liked_post_ids
+from .hashtags import extract_hashtags, index_post_hashtags, normalize_hashtag
 from .helpers import generate_presigned_urls
+from .pagination import InvalidCursor, paginate_newest_first
+from .timeline import fan_out_post, get_timeline_page
+from .trends import record_post_hashtags
 import json
 
 @api_view(['GET'])
 def post_list(request):
-    # Show all public posts + user's own private posts
-    posts = Post.objects.filter(is_private=False) | Post.objects.filter(created_by=request.user)
-
     trend = request.GET.get('trend', '')
 
-    if trend:
-        posts = posts.filter(body__icontains='#' + trend)
-    
-    posts = posts.order_by('-created_at')
-
-    serializer = PostSerializer(posts, many=True)
+    try:
+        if trend:
+            # Public posts + user's own private posts carrying the hashtag
+            tagged = PostHashtag.objects.filter(hashtag=normalize_hashtag(trend)).filter(
+                Q(post__is_private=False) | Q(post__created_by=request.user)
+            )
+            tagged, next_cursor = paginate_newest_first(tagged, request, pk_field='post_id')
+            posts = Post.objects.for_feed().in_bulk([row.post_id for row in tagged])
+            posts = [posts[row.post_id] for row in tagged if row.post_id in posts]
+        else:
+            # Home feed: the materialized timeline (own and friends' posts) plus public posts
+            posts, next_cursor = get_timeline_page(request.user, request)
+    except InvalidCursor:
+        return JsonResponse({'error': 'invalid cursor'}, status=400)
+
+    serializer = PostSerializer(posts, many=True, context={'liked_post_ids': liked_post_ids(request.user, posts)})
 
-    return JsonResponse(serializer.data, safe=False)
+    return JsonResponse({
+        'results': serializer.data,
+        'next': next_cursor
+    })
 
 
 @api_view(['GET'])
@@ -40,7 +57,6 @@ def post_detail(request, pk):
         user_ids.append(user.id)
 
     post = Post.objects.filter(Q(created_by_id__in=list(user_ids)) | Q(is_private=False)).get(pk=pk)
-    print(post.likes.filter(created_by=request.user).exists())
 
     return JsonResponse({
         'post': PostDetailSerializer(post).data,
@@ -51,17 +67,19 @@ def post_detail(request, pk):
 @api_view(['GET'])
 def post_list_profile(request, id):   
     user = User.objects.get(pk=id)
-    posts = Post.objects.filter(created_by_id=id)
+    posts = Post.objects.for_feed().filter(created_by_id=id)
+    is_friend = user.friends.filter(pk=request.user.pk).exists()
 
-    if not request.user in user.friends.all():
+    if not is_friend:
         posts = posts.filter(is_private=False)
 
-    posts_serializer = PostSerializer(posts, many=True)
-    user_serializer = UserSerializer(user)
+    posts = list(posts)
+    posts_serializer = PostSerializer(posts, many=True, context={'liked_post_ids': liked_post_ids(request.user, posts)})
+    user_data = get_or_compute('profile', lambda: UserSerializer(user).data, scope=str(user.id))
 
     can_send_friendship_request = True
 
-    if request.user in user.friends.all():
+    if is_friend:
         can_send_friendship_request = False
     
     check1 = FriendshipRequest.objects.filter(created_for=request.user).filter(created_by=user)
@@ -72,7 +90,7 @@ def post_list_profile(request, id):
 
     return JsonResponse({
         'posts': posts_serializer.data,
-        'user': user_serializer.data,
+        'user': user_data,
         'can_send_friendship_request': can_send_friendship_request
     }, safe=False)
 
@@ -84,7 +102,13 @@ def post_create(request):
         print("Form is valid")
         post = form.save(commit=False)
         post.created_by = request.user
-        post.save()
+
+        with transaction.atomic():
+            post.save()
+            User.objects.filter(pk=request.user.pk).update(posts_count=F('posts_count') + 1)
+
+        # update() skips post_save, which is what normally drops the cached profile
+        invalidate('profile', str(request.user.pk))
 
         # Handle multiple attachment URLs from the request (expecting a list of dicts: [{url, content_type}, ...])
         attachments_data = json.loads(request.POST.get('attachments', '[]'))
@@ -101,10 +125,11 @@ def post_create(request):
                 )
                 post.attachments.add(attachment)
 
-        # Update user's posts_count to reflect the actual number of posts
-        user = request.user
-        user.posts_count = Post.objects.filter(created_by=user).count()
-        user.save()
+        fan_out_post(post)
+        hashtags = extract_hashtags(post.body)
+        index_post_hashtags(post, hashtags)
+        record_post_hashtags(post, hashtags)
+        index_post(post)
 
         serializer = PostSerializer(post)
 
@@ -135,33 +160,22 @@ def get_presigned_url(request):
 @api_view(['POST'])
 def post_like(request, pk):
     # user = User.objects.get(id=request.user.id)
-    post = Post.objects.get(pk=pk)
-
-    if not post.likes.filter(created_by=request.user):
-        like = Like.objects.create(created_by=request.user)
+    post = Post.objects.select_related('created_by').get(pk=pk)
 
-        post = Post.objects.get(pk=pk)
-        post.likes_count = post.likes_count + 1
-        post.likes.add(like)
-        post.save()
-
-        try:
-            # Update connections object
-            connection_obj = Connection.objects.filter(Q(user1=request.user, user2=post.created_by) | 
-                                                    Q(user1=post.created_by, user2=request.user)).first()
-            
-            if connection_obj is None:
-                connection_obj = Connection.objects.create(user1=request.user, user2=post.created_by,
-                                                        score=0.5, last_interaction=datetime.now())
-
-            connection_obj.score += 0.5
-            connection_obj.last_interaction = datetime.now()
+    try:
+        # Insert-or-ignore: the unique (post, created_by) pair rejects a second like
+        with transaction.atomic():
+            Like.objects.create(post=post, created_by=request.user)
+            Post.objects.filter(pk=pk).update(likes_count=F('likes_count') + 1)
+        liked = True
+    except IntegrityError:
+        liked = False
 
-            connection_obj.save()
-        except Exception as e:
-            print(e)
+    if liked:
+        # Buffered; score increments are written in batches off the request path
+        interactions.record(request.user.id, post.created_by_id, interactions.LIKE_POINTS)
 
-        notification = create_notification(request, 'post_like', post_id=post.id)
+        create_notification(request.user, post.created_by, 'post_like', post_id=post.id)
 
         return JsonResponse({'message': 'like created'})
     else:
@@ -170,31 +184,16 @@ def post_like(request, pk):
 
 @api_view(['POST'])
 def post_create_comment(request, pk):
-    comment = Comment.objects.create(body=request.data.get('body'), created_by=request.user)
+    post = Post.objects.select_related('created_by').get(pk=pk)
 
-    post = Post.objects.get(pk=pk)
-    post.comments.add(comment)
-    post.comments_count = post.comments_count + 1
-    post.save()
+    with transaction.atomic():
+        comment = Comment.objects.create(body=request.data.get('body'), created_by=request.user)
+        post.comments.add(comment)
+        Post.objects.filter(pk=pk).update(comments_count=F('comments_count') + 1)
 
-    try:
-        # Update connections object
-        connection_obj = Connection.objects.filter(Q(user1=request.user, user2=post.created_by) | 
-                                            Q(user1=post.created_by, user2=request.user)).first()
-    
-        if connection_obj is None:
-            connection_obj = Connection.objects.create(user1=request.user, user2=post.created_by,
-                                                       score=1, last_interaction=datetime.now())
-
-        connection_obj.score += 1
-        connection_obj.last_interaction = datetime.now()
-
-        connection_obj.save()
+    interactions.record(request.user.id, post.created_by_id, interactions.COMMENT_POINTS)
 
-    except Exception as e:
-        print(e)
-
-    notification = create_notification(request, 'post_comment', post_id=post.id)
+    create_notification(request.user, post.created_by, 'post_comment', post_id=post.id)
 
     serializer = CommentSerializer(comment)
 
@@ -204,11 +203,14 @@ def post_create_comment(request, pk):
 @api_view(['DELETE'])
 def post_delete(request, pk):
     post = Post.objects.filter(created_by=request.user).get(pk=pk)
-    post.delete()
 
-    user = request.user
-    user.posts_count = user.posts_count - 1
-    user.save()
+    with transaction.atomic():
+        # Timeline entries cascade with the post
+        post.delete()
+        record_post_hashtags(post, delta=-1)
+        User.objects.filter(pk=request.user.pk).update(posts_count=F('posts_count') - 1)
+
+    invalidate('profile', str(request.user.pk))
 
     return JsonResponse({'message': 'post deleted'})
 
@@ -224,6 +226,6 @@ def post_report(request, pk):
 
 @api_view(['GET'])
 def get_trends(request):
-    serializer = TrendSerializer(Trend.objects.all(), many=True)
+    data = get_or_compute('trends', lambda: TrendSerializer(Trend.objects.all(), many=True).data)
 
-    return JsonResponse(serializer.data, safe=False)
\ No newline at end of file
+    return JsonResponse(data, safe=False)
\ No newline at end of file
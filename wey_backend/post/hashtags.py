@@ -0,0 +1,36 @@
+import re
+
+from .models import PostHashtag
+
+
+# Tags longer than the PostHashtag / HashtagBucket column are ignored rather
+# than truncated
+HASHTAG_MAX_LENGTH = PostHashtag._meta.get_field('hashtag').max_length
+HASHTAG_RE = re.compile(r'#(\w{1,%d})(?!\w)' % HASHTAG_MAX_LENGTH)
+
+
+def normalize_hashtag(hashtag):
+    return hashtag.lstrip('#').lower()
+
+
+def extract_hashtags(text):
+    # Each hashtag counts once per post, case-insensitively
+    hashtags = (normalize_hashtag(tag) for tag in HASHTAG_RE.findall(text or ''))
+
+    # Lowercasing can lengthen some characters, so check again
+    return list(dict.fromkeys(tag for tag in hashtags if len(tag) <= HASHTAG_MAX_LENGTH))
+
+
+def index_post_hashtags(post, hashtags=None):
+    """
+    (Re)builds the hashtag rows of a post. Call after creating or editing it;
+    pass `hashtags` when they were already extracted from its body.
+    """
+    if hashtags is None:
+        hashtags = extract_hashtags(post.body)
+
+    PostHashtag.objects.filter(post=post).delete()
+    PostHashtag.objects.bulk_create([
+        PostHashtag(hashtag=hashtag, post_id=post.pk, created_at=post.created_at)
+        for hashtag in hashtags
+    ], ignore_conflicts=True)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from post.hashtags import extract_hashtags
+from post.models import Post, PostHashtag
+
+
+class Command(BaseCommand):
+    help = 'Build the hashtag index for existing posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.filter(body__contains='#').values_list('id', 'body', 'created_at')
+        total = posts.count()
+        rows = []
+        created = 0
+
+        for i, (post_id, body, created_at) in enumerate(posts.iterator(), 1):
+            rows += [
+                PostHashtag(hashtag=hashtag, post_id=post_id, created_at=created_at)
+                for hashtag in extract_hashtags(body)
+            ]
+
+            if len(rows) >= options['batch_size']:
+                PostHashtag.objects.bulk_create(rows, ignore_conflicts=True)
+                created += len(rows)
+                rows = []
+                self.stdout.write(f'[{i}/{total}] posts indexed')
+
+        if rows:
+            PostHashtag.objects.bulk_create(rows, ignore_conflicts=True)
+            created += len(rows)
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Wrote {created} hashtag rows'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from account.models import User
+from post.timeline import backfill_user_timelines
+
+
+class Command(BaseCommand):
+    help = 'Backfill materialized home timelines from existing posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        authors = User.objects.filter(posts__isnull=False).distinct()
+        total = authors.count()
+        created = 0
+
+        for i, author in enumerate(authors.iterator(), 1):
+            created += backfill_user_timelines(author, batch_size=options['batch_size'])
+            self.stdout.write(f'[{i}/{total}] {author.email}')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Wrote {created} timeline entries'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from post.trends import TrendsJob, regenerate_trends
+from wey_backend.jobs import run_job
+
+
+class Command(BaseCommand):
+    help = 'Regenerate the 24h trends from the hourly hashtag buckets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Recount the buckets from the posts table first')
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--resume', action='store_true', help='Skip shards finished by a crashed run')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            job = TrendsJob()
+            run_job(job, workers=options['workers'], resume=options['resume'], report=self.stdout.write)
+            trends = job.trends
+        else:
+            trends = regenerate_trends()
+
+        for trend in trends:
+            self.stdout.write(f'{trend.hashtag} {trend.occurences}')
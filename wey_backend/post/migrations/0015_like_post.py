@@ -0,0 +1,59 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def copy_likes_to_post_fk(apps, schema_editor):
+    Like = apps.get_model('post', 'Like')
+    Post = apps.get_model('post', 'Post')
+    PostLikes = Post.likes.through
+
+    seen = set()
+
+    for like_id, post_id, user_id in PostLikes.objects.values_list('like_id', 'post_id', 'like__created_by_id').order_by('like__created_at'):
+        if (post_id, user_id) in seen:
+            continue
+
+        seen.add((post_id, user_id))
+        Like.objects.filter(pk=like_id, legacy_post__isnull=True).update(legacy_post_id=post_id)
+
+    # Likes that were never attached to a post, or were duplicates
+    Like.objects.filter(legacy_post__isnull=True).delete()
+
+    counts = Like.objects.filter(legacy_post=OuterRef('pk')).values('legacy_post').annotate(c=Count('id')).values('c')
+    Post.objects.update(likes_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0014_timelineentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='like',
+            name='legacy_post',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='post.post'),
+        ),
+        migrations.RunPython(copy_likes_to_post_fk, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='post',
+            name='likes',
+        ),
+        migrations.RenameField(
+            model_name='like',
+            old_name='legacy_post',
+            new_name='post',
+        ),
+        migrations.AlterField(
+            model_name='like',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='post.post'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='like',
+            unique_together={('post', 'created_by')},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-17 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0015_like_post'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HashtagBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hashtag', models.CharField(max_length=255)),
+                ('hour', models.DateTimeField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='hashtagbucket',
+            index=models.Index(fields=['hour'], name='hashtagbucket_hour_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hashtagbucket',
+            unique_together={('hashtag', 'hour')},
+        ),
+    ]
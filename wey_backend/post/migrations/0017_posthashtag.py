@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-17 12:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0016_hashtagbucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostHashtag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hashtag', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hashtags', to='post.post')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='posthashtag',
+            index=models.Index(fields=['hashtag', '-created_at', '-post'], name='posthashtag_tag_created_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='posthashtag',
+            unique_together={('hashtag', 'post')},
+        ),
+    ]
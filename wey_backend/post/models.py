@@ -9,9 +9,14 @@ import os
 
 class Like(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    post = models.ForeignKey('Post', related_name='likes', on_delete=models.CASCADE)
     created_by = models.ForeignKey(User, related_name='likes', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # One like per user per post; a duplicate insert fails instead of double counting
+        unique_together = ('post', 'created_by')
+
 
 class Comment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -48,6 +53,12 @@ class PostAttachment(models.Model):
         return False
 
 
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        # Everything PostSerializer touches, loaded in a fixed number of queries
+        return self.select_related('created_by').prefetch_related('attachments')
+
+
 class Post(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     body = models.TextField(blank=True, null=True)
@@ -56,7 +67,6 @@ class Post(models.Model):
 
     is_private = models.BooleanField(default=False)
 
-    likes = models.ManyToManyField(Like, blank=True)
     likes_count = models.IntegerField(default=0)
 
     comments = models.ManyToManyField(Comment, blank=True)
@@ -67,8 +77,14 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(User, related_name='posts', on_delete=models.CASCADE)
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         ordering = ('-created_at',)
+        indexes = [
+            # Keyset pagination of the feed walks (created_at, id) newest first
+            models.Index(fields=['-created_at', '-id'], name='post_created_at_id_idx'),
+        ]
     
     def created_at_formatted(self):
        return timesince(self.created_at)
@@ -76,4 +92,44 @@ class Post(models.Model):
 
 class Trend(models.Model):
     hashtag = models.CharField(max_length=255)
-    occurences = models.IntegerField()
\ No newline at end of file
+    occurences = models.IntegerField()
+
+
+class HashtagBucket(models.Model):
+    # Hashtag uses in public posts per hour; trends sum the last 24 buckets
+    hashtag = models.CharField(max_length=255)
+    hour = models.DateTimeField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('hashtag', 'hour')
+        indexes = [
+            models.Index(fields=['hour'], name='hashtagbucket_hour_idx'),
+        ]
+
+
+class TimelineEntry(models.Model):
+    # Materialized home feed: one row per (reader, post), written when the post
+    # is created. created_at is copied from the post so a page is one range scan.
+    owner = models.ForeignKey(User, related_name='timeline_entries', on_delete=models.CASCADE)
+    post = models.ForeignKey(Post, related_name='timeline_entries', on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('owner', 'post')
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-post'], name='timeline_owner_created_idx'),
+        ]
+
+
+class PostHashtag(models.Model):
+    # Normalized hashtag -> post index so ?trend= is an indexed lookup
+    hashtag = models.CharField(max_length=255)
+    post = models.ForeignKey(Post, related_name='hashtags', on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('hashtag', 'post')
+        indexes = [
+            models.Index(fields=['hashtag', '-created_at', '-post'], name='posthashtag_tag_created_idx'),
+        ]
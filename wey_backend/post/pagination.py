@@ -0,0 +1,75 @@
+import base64
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, pk):
+    # Opaque to clients: base64 of the (created_at, id) pair of the last row
+    payload = json.dumps([created_at.isoformat(), str(pk)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = parse_datetime(created_at)
+        pk = uuid.UUID(pk)
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+
+    if created_at is None:
+        raise InvalidCursor(cursor)
+
+    return created_at, pk
+
+
+def get_page_size(request, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    try:
+        page_size = int(request.GET.get('page_size', default))
+    except ValueError:
+        page_size = default
+
+    return max(1, min(page_size, maximum))
+
+
+def paginate_newest_first(queryset, request, field='created_at', pk_field='id', cursor_param='cursor',
+                          default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """
+    Keyset pagination over (field, pk_field), newest first.
+
+    Returns the rows of the requested page and the cursor for the next one
+    (None on the last page). Raises InvalidCursor for a malformed cursor.
+    """
+    page_size = get_page_size(request, default, maximum)
+    queryset = queryset.order_by('-' + field, '-' + pk_field)
+
+    cursor = request.GET.get(cursor_param)
+
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{field + '__lt': created_at}) |
+            Q(**{field: created_at, pk_field + '__lt': pk})
+        )
+
+    # Fetch one extra row so we know whether another page exists
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, field), getattr(last, pk_field))
+
+    return rows, next_cursor
@@ -2,7 +2,12 @@ from rest_framework import serializers
 
 from account.serializers import UserSerializer
 
-from .models import Post, PostAttachment, Comment, Trend
+from .models import Post, PostAttachment, Comment, Like, Trend
+
+
+def liked_post_ids(user, posts):
+    # One IN lookup for the whole page instead of one query per post
+    return set(Like.objects.filter(created_by=user, post__in=[post.id for post in posts]).values_list('post_id', flat=True))
 
 
 class PostAttachmentSerializer(serializers.ModelSerializer):
@@ -16,10 +21,14 @@ class PostAttachmentSerializer(serializers.ModelSerializer):
 class PostSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     attachments = PostAttachmentSerializer(read_only=True, many=True)
+    i_liked = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = ('id', 'body', 'is_private', 'likes_count', 'comments_count', 'created_by', 'created_at_formatted', 'attachments')
+        fields = ('id', 'body', 'is_private', 'likes_count', 'comments_count', 'created_by', 'created_at_formatted', 'attachments', 'i_liked')
+
+    def get_i_liked(self, obj):
+        return obj.id in self.context.get('liked_post_ids', ())
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -0,0 +1,18 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from account.models import User
+
+from .timeline import link_friends, unlink_friends
+
+
+@receiver(m2m_changed, sender=User.friends.through)
+def sync_timelines_on_friendship_change(sender, instance, action, pk_set, **kwargs):
+    # Django sends one signal per add/remove for the symmetrical relation,
+    # from the caller's side, so both helpers cover both directions
+    if action == 'post_add' and pk_set:
+        link_friends(instance, pk_set)
+    elif action == 'post_remove' and pk_set:
+        unlink_friends(instance, pk_set)
+    elif action == 'pre_clear':
+        unlink_friends(instance, list(instance.friends.values_list('id', flat=True)))
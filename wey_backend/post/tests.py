@@ -1,3 +1,159 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+
+from account.models import User
+
+from .models import Post, PostAttachment
+from .timeline import fan_out_post
+
+
+STORAGES = {
+    **settings.STORAGES,
+    'default': {
+        **settings.STORAGES['default'],
+        'OPTIONS': {**settings.STORAGES['default']['OPTIONS'], 'custom_domain': 'cdn.example.com'},
+    },
+}
+
+
+@override_settings(STORAGES=STORAGES)
+class FeedQueryCountTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(name='Reader', email='reader@example.com', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_posts(self, count):
+        for i in range(count):
+            n = User.objects.count()
+            author = User.objects.create_user(name=f'Author {n}', email=f'author{n}@example.com', password='pass')
+            self.user.friends.add(author)
+            post = Post.objects.create(body=f'post {i}', created_by=author)
+            fan_out_post(post)
+            attachment = PostAttachment.objects.create(url=f'post_attachments/{i}.png', created_by=author)
+            post.attachments.add(attachment)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_post_list_query_count_is_fixed(self):
+        self.create_posts(2)
+        small_page = self.count_queries('/api/posts/')
+
+        self.create_posts(10)
+        large_page = self.count_queries('/api/posts/')
+
+        self.assertEqual(small_page, large_page)
+
+    def test_post_list_profile_query_count_is_fixed(self):
+        for i in range(2):
+            Post.objects.create(body=f'mine {i}', created_by=self.user)
+        small_page = self.count_queries(f'/api/posts/profile/{self.user.id}/')
+
+        for i in range(10):
+            Post.objects.create(body=f'more {i}', created_by=self.user)
+        large_page = self.count_queries(f'/api/posts/profile/{self.user.id}/')
+
+        self.assertEqual(small_page, large_page)
+
+
+class TimelineTest(TestCase):
+    def setUp(self):
+        self.reader = User.objects.create_user(name='Reader', email='reader@example.com', password='pass')
+        self.author = User.objects.create_user(name='Author', email='author@example.com', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def feed_ids(self):
+        return [post['id'] for post in self.client.get('/api/posts/').json()['results']]
+
+    def test_friends_private_posts_follow_the_friendship(self):
+        post = Post.objects.create(body='friends only', is_private=True, created_by=self.author)
+        fan_out_post(post)
+        self.assertEqual(self.feed_ids(), [])
+
+        self.reader.friends.add(self.author)
+        self.assertEqual(self.feed_ids(), [str(post.id)])
+
+        self.reader.friends.remove(self.author)
+        self.assertEqual(self.feed_ids(), [])
+
+    def test_public_posts_of_non_friends_stay_in_the_feed(self):
+        post = Post.objects.create(body='hello everyone', created_by=self.author)
+        fan_out_post(post)
+
+        self.assertEqual(self.feed_ids(), [str(post.id)])
+
+
+class LikeMigrationTest(TransactionTestCase):
+    migrate_from = ('post', '0014_timelineentry')
+    migrate_to = ('post', '0015_like_post')
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([target])
+        return executor.loader.project_state(target).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_likes_move_to_post_fk_and_are_recounted(self):
+        # Users come from the current model; their counter columns postdate 0014
+        author = User.objects.create_user(name='Author', email='author@example.com', password='pass')
+        fan = User.objects.create_user(name='Fan', email='fan@example.com', password='pass')
+
+        apps = self.migrate(self.migrate_from)
+        OldPost = apps.get_model('post', 'Post')
+        OldLike = apps.get_model('post', 'Like')
+
+        post = OldPost.objects.create(body='liked', created_by_id=author.pk, likes_count=7)
+        first = OldLike.objects.create(created_by_id=fan.pk)
+        duplicate = OldLike.objects.create(created_by_id=fan.pk)
+        own = OldLike.objects.create(created_by_id=author.pk)
+        post.likes.add(first, duplicate, own)
+        OldLike.objects.filter(pk=duplicate.pk).update(created_at=first.created_at + timedelta(seconds=1))
+        OldLike.objects.create(created_by_id=fan.pk)
+
+        apps = self.migrate(self.migrate_to)
+        Like = apps.get_model('post', 'Like')
+        Post = apps.get_model('post', 'Post')
+
+        # One like per (post, user), the earliest kept; the orphan is dropped
+        self.assertEqual(
+            sorted(Like.objects.values_list('pk', flat=True)),
+            sorted([first.pk, own.pk]),
+        )
+        self.assertTrue(all(like.post_id == post.pk for like in Like.objects.all()))
+        self.assertEqual(Post.objects.get(pk=post.pk).likes_count, 2)
+
+
+class PostsCountTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(name='Author', email='author@example.com', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def profile_posts_count(self):
+        return self.client.get(f'/api/posts/profile/{self.user.id}/').json()['user']['posts_count']
+
+    def test_cached_profile_follows_create_and_delete(self):
+        self.assertEqual(self.profile_posts_count(), 0)
+
+        self.client.post('/api/posts/create/', {'body': 'hello'})
+        self.assertEqual(self.profile_posts_count(), 1)
+
+        post = Post.objects.get()
+        self.client.delete(f'/api/posts/{post.id}/delete/')
+        self.assertEqual(self.profile_posts_count(), 0)
@@ -0,0 +1,115 @@
+from django.db.models import Q
+
+from account.models import User
+
+from .models import Post, TimelineEntry
+from .pagination import decode_cursor, encode_cursor, get_page_size
+
+
+# Authors with more friends than this are not fanned out on write; their
+# friends merge the author's posts into the feed at read time instead.
+FANOUT_LIMIT = 1000
+
+# How many of a new friend's recent posts get pushed into a timeline
+FRIEND_BACKFILL_DEPTH = 100
+
+
+def fan_out_post(post):
+    author = post.created_by
+    owner_ids = [author.pk]
+
+    if author.friends_count <= FANOUT_LIMIT:
+        owner_ids += list(author.friends.values_list('id', flat=True))
+
+    TimelineEntry.objects.bulk_create([
+        TimelineEntry(owner_id=owner_id, post_id=post.pk, created_at=post.created_at)
+        for owner_id in owner_ids
+    ], ignore_conflicts=True)
+
+
+def push_recent_posts(owner_id, author):
+    if author.friends_count > FANOUT_LIMIT:
+        return
+
+    posts = Post.objects.filter(created_by=author).values_list('id', 'created_at')[:FRIEND_BACKFILL_DEPTH]
+
+    TimelineEntry.objects.bulk_create([
+        TimelineEntry(owner_id=owner_id, post_id=post_id, created_at=created_at)
+        for post_id, created_at in posts
+    ], ignore_conflicts=True)
+
+
+def link_friends(user, friend_ids):
+    for friend in User.objects.filter(pk__in=friend_ids):
+        push_recent_posts(user.pk, friend)
+        push_recent_posts(friend.pk, user)
+
+
+def unlink_friends(user, friend_ids):
+    TimelineEntry.objects.filter(
+        Q(owner=user, post__created_by_id__in=friend_ids) |
+        Q(owner_id__in=friend_ids, post__created_by=user)
+    ).delete()
+
+
+def get_timeline_page(user, request):
+    """
+    Returns one page of the user's home feed (own and friends' posts plus
+    everyone's public posts) and the cursor for the next page. Raises
+    InvalidCursor for a malformed cursor.
+    """
+    page_size = get_page_size(request)
+
+    entries = TimelineEntry.objects.filter(owner=user)
+    high_degree_ids = list(
+        user.friends.filter(friends_count__gt=FANOUT_LIMIT).values_list('id', flat=True)
+    )
+    # Public posts aren't fanned out to everyone, so they are merged in at
+    # read time together with posts of friends that weren't fanned out
+    fallback = Post.objects.filter(Q(is_private=False) | Q(created_by_id__in=high_degree_ids))
+
+    cursor = request.GET.get('cursor')
+
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        entries = entries.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, post_id__lt=pk))
+        fallback = fallback.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    keys = set(entries.order_by('-created_at', '-post_id').values_list('created_at', 'post_id')[:page_size + 1])
+    keys |= set(fallback.order_by('-created_at', '-id').values_list('created_at', 'id')[:page_size + 1])
+
+    keys = sorted(keys, reverse=True)
+    next_cursor = None
+
+    if len(keys) > page_size:
+        keys = keys[:page_size]
+        next_cursor = encode_cursor(*keys[-1])
+
+    posts = Post.objects.for_feed().in_bulk([pk for created_at, pk in keys])
+
+    return [posts[pk] for created_at, pk in keys if pk in posts], next_cursor
+
+
+def backfill_user_timelines(author, batch_size=1000):
+    owner_ids = [author.pk]
+
+    if author.friends_count <= FANOUT_LIMIT:
+        owner_ids += list(author.friends.values_list('id', flat=True))
+
+    entries = []
+    created = 0
+
+    for post_id, created_at in Post.objects.filter(created_by=author).values_list('id', 'created_at').iterator():
+        for owner_id in owner_ids:
+            entries.append(TimelineEntry(owner_id=owner_id, post_id=post_id, created_at=created_at))
+
+        if len(entries) >= batch_size:
+            TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+            created += len(entries)
+            entries = []
+
+    if entries:
+        TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        created += len(entries)
+
+    return created
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from wey_backend.cache import invalidate
+from wey_backend.jobs import Job
+
+from .hashtags import extract_hashtags
+from .models import HashtagBucket, Post, Trend
+
+
+TRENDS_WINDOW = timedelta(hours=24)
+TRENDS_LIMIT = 10
+
+# Buckets older than this are dropped when trends are regenerated
+BUCKET_RETENTION = timedelta(days=7)
+
+
+def hour_bucket(dt):
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def window_hours():
+    # The current (partial) hour and the ones before it, TRENDS_WINDOW in all
+    now = hour_bucket(timezone.now())
+    count = int(TRENDS_WINDOW / timedelta(hours=1))
+
+    return [now - timedelta(hours=i) for i in reversed(range(count))]
+
+
+def record_post_hashtags(post, hashtags=None, delta=1):
+    if post.is_private:
+        return
+
+    if hashtags is None:
+        hashtags = extract_hashtags(post.body)
+
+    hour = hour_bucket(post.created_at)
+
+    for hashtag in hashtags:
+        updated = HashtagBucket.objects.filter(hashtag=hashtag, hour=hour).update(count=F('count') + delta)
+
+        if updated or delta < 0:
+            continue
+
+        try:
+            with transaction.atomic():
+                HashtagBucket.objects.create(hashtag=hashtag, hour=hour, count=delta)
+        except IntegrityError:
+            # Another request created the bucket first
+            HashtagBucket.objects.filter(hashtag=hashtag, hour=hour).update(count=F('count') + delta)
+
+
+def regenerate_trends():
+    top = (
+        HashtagBucket.objects.filter(hour__gte=window_hours()[0])
+        .values('hashtag')
+        .annotate(total=Sum('count'))
+        .filter(total__gt=0)
+        .order_by('-total')[:TRENDS_LIMIT]
+    )
+    trends = [Trend(hashtag=row['hashtag'], occurences=row['total']) for row in top]
+
+    # Readers see either the old or the new snapshot, never an empty table
+    with transaction.atomic():
+        Trend.objects.all().delete()
+        Trend.objects.bulk_create(trends)
+
+    invalidate('trends')
+
+    HashtagBucket.objects.filter(hour__lt=hour_bucket(timezone.now()) - BUCKET_RETENTION).delete()
+
+    return trends
+
+
+class TrendsJob(Job):
+    """
+    Recounts the hourly buckets of the trends window from the posts table,
+    one shard per hour, then regenerates the trends from them.
+    """
+
+    name = 'trends'
+
+    def prepare(self):
+        self.hours = window_hours()
+
+    def shards(self):
+        return [hour.isoformat() for hour in self.hours]
+
+    def run_shard(self, shard):
+        hour = parse_datetime(shard)
+        counts = {}
+
+        posts = Post.objects.filter(created_at__gte=hour, created_at__lt=hour + timedelta(hours=1), is_private=False)
+
+        for body in posts.values_list('body', flat=True).iterator():
+            for hashtag in extract_hashtags(body):
+                counts[hashtag] = counts.get(hashtag, 0) + 1
+
+        return counts
+
+    def finish(self, results):
+        with transaction.atomic():
+            HashtagBucket.objects.filter(hour__gte=self.hours[0]).delete()
+            HashtagBucket.objects.bulk_create([
+                HashtagBucket(hashtag=hashtag, hour=hour, count=count)
+                for hour, counts in zip(self.hours, results)
+                for hashtag, count in counts.items()
+            ], batch_size=1000)
+
+        self.trends = regenerate_trends()
@@ -1,34 +1,55 @@
-from django.db.models import Q
 from django.http import JsonResponse
 
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 
 from account.models import User
 from account.serializers import UserSerializer
-from post.models import Post
-from post.serializers import PostSerializer
+from post.serializers import PostSerializer, liked_post_ids
+
+from .index import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, search_posts
+from .typeahead import index as typeahead_index
 
 
 @api_view(['POST'])
 def search(request):
     data = request.data
     query = data['query']
-    user_ids = [request.user.id]
 
-    for user in request.user.friends.all():
-        user_ids.append(user.id)
+    try:
+        page = int(data.get('page', 1))
+        page_size = int(data.get('page_size', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'invalid page'}, status=400)
 
-    users = User.objects.filter(name__icontains=query)
-    users_serializer = UserSerializer(users, many=True)
+    users = []
 
-    posts = Post.objects.filter(
-        Q(body__icontains=query, is_private=False) | 
-        Q(created_by_id__in=list(user_ids), body__icontains=query)
-    )
+    if page == 1:
+        users = User.objects.filter(name__icontains=query)[:MAX_PAGE_SIZE]
 
-    posts_serializer = PostSerializer(posts, many=True)
+    users_serializer = UserSerializer(users, many=True)
+
+    posts, has_next = search_posts(request.user, query, page, page_size)
+    posts_serializer = PostSerializer(posts, many=True, context={'liked_post_ids': liked_post_ids(request.user, posts)})
 
     return JsonResponse({
         'users': users_serializer.data,
-        'posts': posts_serializer.data
-    }, safe=False)
\ No newline at end of file
+        'posts': posts_serializer.data,
+        'next_page': page + 1 if has_next else None
+    }, safe=False)
+
+
+@api_view(['GET'])
+def typeahead(request):
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 10)), MAX_PAGE_SIZE))
+    except ValueError:
+        limit = 10
+
+    users = typeahead_index.search(
+        request.GET.get('q', ''),
+        limit=limit,
+        friend_ids=set(request.user.friends.values_list('id', flat=True)),
+        suggestion_ids=set(request.user.people_you_may_know.values_list('id', flat=True)),
+    )
+
+    return JsonResponse(users, safe=False)
@@ -0,0 +1,79 @@
+import math
+import re
+from collections import Counter
+
+from django.db.models import Case, Count, F, FloatField, Q, Sum, When
+
+from post.models import Post
+from wey_backend.cache import get_or_compute
+
+from .models import PostSearchTerm
+
+
+TOKEN_RE = re.compile(r'\w+')
+
+MAX_TERM_LENGTH = 64
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+def tokenize(text):
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall((text or '').lower())]
+
+
+def index_post(post):
+    """
+    (Re)builds the search terms of a post. Rows cascade when the post is deleted.
+    """
+    PostSearchTerm.objects.filter(post=post).delete()
+    # Terms the DB collation treats as equal (e.g. "café" and "cafe" on
+    # MySQL) collide on the unique key; only the first is kept
+    PostSearchTerm.objects.bulk_create([
+        PostSearchTerm(term=term, post_id=post.pk, count=count)
+        for term, count in Counter(tokenize(post.body)).items()
+    ], ignore_conflicts=True)
+
+
+def search_posts(user, query, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Ranks posts visible to the user (public, or by the user and their friends)
+    by how many query terms they contain, then by tf-idf, then by recency.
+    Returns the posts on the page and whether another page exists.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+
+    if not terms:
+        return [], False
+
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    offset = (max(page, 1) - 1) * page_size
+
+    # Only feeds the idf weights, so a few minutes stale is fine
+    total_posts = get_or_compute('post_count', Post.objects.count) or 1
+    document_frequency = dict(
+        PostSearchTerm.objects.filter(term__in=terms).values_list('term').annotate(n=Count('id'))
+    )
+    idf = {term: math.log(1 + total_posts / (1 + document_frequency.get(term, 0))) for term in terms}
+
+    visible_to = [user.id, *user.friends.values_list('id', flat=True)]
+
+    ranked = (
+        PostSearchTerm.objects.filter(term__in=terms)
+        .filter(Q(post__is_private=False) | Q(post__created_by_id__in=visible_to))
+        .values('post_id', 'post__created_at')
+        .annotate(
+            matched=Count('term'),
+            score=Sum(Case(
+                *[When(term=term, then=F('count') * idf[term]) for term in terms],
+                output_field=FloatField()
+            ))
+        )
+        .order_by('-matched', '-score', '-post__created_at')
+    )
+    ids = [row['post_id'] for row in ranked[offset:offset + page_size + 1]]
+    has_next = len(ids) > page_size
+    ids = ids[:page_size]
+
+    posts = Post.objects.for_feed().in_bulk(ids)
+
+    return [posts[pk] for pk in ids if pk in posts], has_next
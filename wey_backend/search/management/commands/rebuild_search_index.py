@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from post.models import Post
+from search.index import index_post
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for all posts'
+
+    def handle(self, *args, **options):
+        posts = Post.objects.only('id', 'body')
+        total = posts.count()
+
+        for i, post in enumerate(posts.iterator(), 1):
+            index_post(post)
+
+            if i % 1000 == 0 or i == total:
+                self.stdout.write(f'[{i}/{total}] posts indexed')
+
+        self.stdout.write(self.style.SUCCESS('\n✓ Search index rebuilt'))
@@ -1,3 +1,13 @@
 from django.db import models
 
-# Create your models here.
+from post.models import Post
+
+
+class PostSearchTerm(models.Model):
+    # Inverted index: one row per distinct term in a post, with its frequency
+    term = models.CharField(max_length=64)
+    post = models.ForeignKey(Post, related_name='search_terms', on_delete=models.CASCADE)
+    count = models.IntegerField(default=1)
+
+    class Meta:
+        unique_together = ('term', 'post')
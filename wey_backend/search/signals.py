@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from account.models import User
+
+from .typeahead import index
+
+
+@receiver(post_save, sender=User)
+def update_typeahead_index(sender, instance, **kwargs):
+    # Covers signup, activation and editprofile
+    index.update_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def remove_from_typeahead_index(sender, instance, **kwargs):
+    index.remove_user(instance.id)
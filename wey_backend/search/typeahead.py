@@ -0,0 +1,133 @@
+import bisect
+import threading
+import unicodedata
+
+from account.models import User
+from wey_backend.rebuild import PeriodicRebuild
+
+
+# Signups and profile edits are applied to the index of the worker that
+# handled them; other workers' copies catch up on the next reload.
+REBUILD_INTERVAL = 10 * 60
+
+# Prefix matches scored per query before the top-k cut
+MAX_CANDIDATES = 500
+
+FRIEND_BOOST = 2
+SUGGESTION_BOOST = 1
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower().strip()
+
+
+def user_keys(name, email):
+    name = normalize(name)
+    email = normalize(email)
+    keys = {name, email, email.split('@')[0], *name.split()}
+    keys.discard('')
+    return keys
+
+
+class PrefixIndex(PeriodicRebuild):
+    """
+    Sorted array of (key, user_id) pairs. A prefix lookup is two binary
+    searches and a slice.
+    """
+
+    rebuild_interval = REBUILD_INTERVAL
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._entries = []
+        self._users = {}
+
+    def _row(self, user):
+        return {'id': str(user.id), 'name': user.name, 'email': user.email, 'get_avatar': user.get_avatar()}
+
+    def rebuild(self):
+        users = {}
+        entries = []
+
+        for user in User.objects.filter(is_active=True).only('id', 'name', 'email', 'avatar').iterator():
+            users[user.id] = self._row(user)
+            entries += [(key, user.id) for key in user_keys(user.name, user.email)]
+
+        entries.sort()
+
+        with self._lock:
+            self._users = users
+            self._entries = entries
+            self._mark_built()
+
+    def remove_user(self, user_id):
+        with self._lock:
+            row = self._users.pop(user_id, None)
+
+            if row is None:
+                return
+
+            for key in user_keys(row['name'], row['email']):
+                i = bisect.bisect_left(self._entries, (key, user_id))
+
+                if i < len(self._entries) and self._entries[i] == (key, user_id):
+                    del self._entries[i]
+
+    def update_user(self, user):
+        if self._built_at is None:
+            return
+
+        self.remove_user(user.id)
+
+        if not user.is_active:
+            return
+
+        with self._lock:
+            self._users[user.id] = self._row(user)
+
+            for key in user_keys(user.name, user.email):
+                bisect.insort(self._entries, (key, user.id))
+
+    def search(self, query, limit=10, friend_ids=(), suggestion_ids=()):
+        prefix = normalize(query)
+
+        if not prefix:
+            return []
+
+        self._ensure_fresh()
+
+        with self._lock:
+            start = bisect.bisect_left(self._entries, (prefix,))
+            end = bisect.bisect_left(self._entries, (prefix + '\uffff',))
+            matches = self._entries[start:min(end, start + MAX_CANDIDATES)]
+
+            # Friends and suggestions that fall outside the candidate window
+            for user_id in {*friend_ids, *suggestion_ids}:
+                row = self._users.get(user_id)
+
+                if row is None:
+                    continue
+
+                keys = user_keys(row['name'], row['email'])
+
+                if prefix in keys:
+                    matches.append((prefix, user_id))
+                elif any(key.startswith(prefix) for key in keys):
+                    matches.append(('', user_id))
+
+            scores = {}
+
+            for key, user_id in matches:
+                score = 1 if key == prefix else 0
+                score += FRIEND_BOOST if user_id in friend_ids else 0
+                score += SUGGESTION_BOOST if user_id in suggestion_ids else 0
+                scores[user_id] = max(score, scores.get(user_id, 0))
+
+            ranked = sorted(scores, key=lambda user_id: (-scores[user_id], self._users[user_id]['name']))
+
+            return [self._users[user_id] for user_id in ranked[:limit]]
+
+
+index = PrefixIndex()
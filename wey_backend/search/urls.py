@@ -5,4 +5,5 @@ from . import api
 
 urlpatterns = [
     path('', api.search, name='search'),
+    path('typeahead/', api.typeahead, name='typeahead'),
 ]
\ No newline at end of file
@@ -0,0 +1,71 @@
+import atexit
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+
+class WriteBuffer:
+    """
+    Collects writes in memory and hands them to write() in batches from a
+    timer thread, off the request path. The flush interval comes from the
+    `interval_setting` setting; 0 (e.g. in tests) writes on every add().
+
+    Subclasses implement write(batch) and may override new_batch() and
+    collect() to merge items as they arrive instead of keeping a list.
+    """
+
+    interval_setting = None
+    default_interval = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = self.new_batch()
+        self._timer = None
+        # Don't lose buffered writes when a worker shuts down
+        atexit.register(self.flush)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, self.interval_setting, self.default_interval)
+
+    def new_batch(self):
+        return []
+
+    def collect(self, batch, item):
+        batch.append(item)
+
+    def write(self, batch):
+        raise NotImplementedError
+
+    def add(self, item):
+        with self._lock:
+            self.collect(self._pending, item)
+
+        if self.flush_interval <= 0:
+            self.flush()
+        else:
+            self._schedule()
+
+    def _schedule(self):
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, self.new_batch()
+
+        if pending:
+            self.write(pending)
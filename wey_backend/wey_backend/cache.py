@@ -0,0 +1,76 @@
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds each cached view stays fresh if nothing invalidates it first
+TTLS = {
+    'trends': 5 * 60,
+    'suggestions': 10 * 60,
+    'profile': 2 * 60,
+    'post_count': 10 * 60,
+}
+
+
+def _version_key(namespace, scope):
+    return f'version:{namespace}:{scope}'
+
+
+def _key(namespace, scope):
+    # Keys embed version numbers; invalidating bumps a version, so stale
+    # entries are simply never read again and age out on their own TTL.
+    # The namespace version (scope '') covers every scope of the namespace.
+    version_keys = [_version_key(namespace, ''), _version_key(namespace, scope)]
+    versions = cache.get_many(version_keys)
+    namespace_version, version = (versions.get(key, 1) for key in version_keys)
+    return f'{namespace}:{scope}:v{namespace_version}.{version}'
+
+
+def _count(namespace, outcome):
+    key = f'stats:{namespace}:{outcome}'
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_or_compute(namespace, compute, scope=''):
+    key = _key(namespace, scope)
+    value = cache.get(key)
+
+    if value is None:
+        _count(namespace, 'misses')
+        logger.debug('cache miss %s', key)
+        value = compute()
+        cache.set(key, value, TTLS[namespace])
+    else:
+        _count(namespace, 'hits')
+
+    return value
+
+
+def invalidate(namespace, scope=''):
+    # Without a scope, drops the cached values of every scope at once
+    key = _version_key(namespace, scope)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def cache_stats():
+    """
+    Hit/miss counters per namespace, e.g. from `manage.py shell`:
+    {'trends': {'hits': 120, 'misses': 3}, ...}
+    """
+    return {
+        namespace: {
+            outcome: cache.get(f'stats:{namespace}:{outcome}', 0)
+            for outcome in ('hits', 'misses')
+        }
+        for namespace in TTLS
+    }
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+
+class Job:
+    """
+    An offline batch job split into independent shards.
+
+    prepare() runs once in the parent before any shard, and its state is
+    shared with the worker processes (they are forked). shards() returns
+    JSON-serializable shard keys, e.g. id or time ranges. run_shard()
+    returns a JSON-serializable result, which is checkpointed. finish()
+    receives every result in shard order and writes the output.
+    """
+
+    name = None
+
+    def prepare(self):
+        pass
+
+    def shards(self):
+        raise NotImplementedError
+
+    def run_shard(self, shard):
+        raise NotImplementedError
+
+    def finish(self, results):
+        pass
+
+
+_worker_job = None
+
+
+def _init_worker(job):
+    global _worker_job
+    _worker_job = job
+
+
+def _run_shard(shard):
+    started = time.perf_counter()
+    result = _worker_job.run_shard(shard)
+    return shard, result, time.perf_counter() - started
+
+
+def _shard_key(shard):
+    return json.dumps(shard, sort_keys=True)
+
+
+def _checkpoint_dir(job):
+    # One file per finished shard, kept until the job finishes so a crashed
+    # run can be resumed
+    return Path(settings.JOB_CHECKPOINT_DIR) / job.name
+
+
+def _save_checkpoint(job, shard, result):
+    directory = _checkpoint_dir(job)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    key = _shard_key(shard)
+    path = directory / f'{hashlib.sha1(key.encode()).hexdigest()}.json'
+    tmp_path = path.with_suffix('.tmp')
+
+    with open(tmp_path, 'w') as f:
+        json.dump({'shard': key, 'result': result}, f)
+
+    os.replace(tmp_path, path)
+
+
+def _load_checkpoint(job):
+    done = {}
+
+    for path in _checkpoint_dir(job).glob('*.json'):
+        with open(path) as f:
+            checkpoint = json.load(f)
+
+        done[checkpoint['shard']] = checkpoint['result']
+
+    return done
+
+
+def _clear_checkpoint(job):
+    shutil.rmtree(_checkpoint_dir(job), ignore_errors=True)
+
+
+def run_job(job, workers=1, resume=False, report=print):
+    """
+    Runs the job's pending shards, in a process pool when workers > 1.
+    With resume=True, shards finished by a previous (crashed) run are
+    taken from its checkpoint instead of being recomputed.
+    """
+    job.prepare()
+
+    shards = job.shards()
+
+    if resume:
+        done = _load_checkpoint(job)
+    else:
+        # A fresh run must not leave old shards around for a later resume
+        _clear_checkpoint(job)
+        done = {}
+
+    pending = [shard for shard in shards if _shard_key(shard) not in done]
+
+    if len(pending) < len(shards):
+        report(f'{job.name}: resuming, {len(shards) - len(pending)}/{len(shards)} shards already done')
+
+    started = time.perf_counter()
+
+    def record(shard, result, seconds):
+        done[_shard_key(shard)] = result
+        _save_checkpoint(job, shard, result)
+        report(f'{job.name}: shard {_shard_key(shard)} done in {seconds:.2f}s ({len(done)}/{len(shards)})')
+
+    if workers > 1 and len(pending) > 1:
+        # Forked children must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+
+        with context.Pool(workers, initializer=_init_worker, initargs=(job,)) as pool:
+            for shard, result, seconds in pool.imap_unordered(_run_shard, pending):
+                record(shard, result, seconds)
+    else:
+        _init_worker(job)
+
+        for shard in pending:
+            record(*_run_shard(shard))
+
+    job.finish([done[_shard_key(shard)] for shard in shards])
+    _clear_checkpoint(job)
+
+    report(f'{job.name}: finished {len(shards)} shards in {time.perf_counter() - started:.2f}s')
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+# Channels are namespaced so a shared Redis can serve other apps too
+CHANNEL_PREFIX = 'wey:'
+
+
+def user_channel(user_id):
+    # Everything pushed to one user's open connections goes through here
+    return f'user:{user_id}'
+
+
+class InProcessBroker:
+    """
+    Delivers messages to subscribers in the same process. Fine for tests
+    and a single ASGI worker; publishers in other processes (e.g. the
+    gunicorn workers serving the REST API) are not seen.
+    """
+
+    def __init__(self, **options):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def publish(self, channel, message):
+        # Called from sync views, possibly off the event loop's thread
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        queue = asyncio.Queue()
+        entry = (asyncio.get_running_loop(), queue)
+
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(entry)
+
+        async def messages():
+            while True:
+                yield await queue.get()
+
+        try:
+            yield messages()
+        finally:
+            with self._lock:
+                self._subscribers[channel].remove(entry)
+
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisBroker:
+    """
+    Redis PUBLISH/SUBSCRIBE, so a message published by any worker reaches
+    connections held by every other worker.
+    """
+
+    def __init__(self, url='redis://127.0.0.1:6379/0', **options):
+        import redis
+
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        self._client.publish(CHANNEL_PREFIX + channel, json.dumps(message, cls=DjangoJSONEncoder))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        from redis import asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(CHANNEL_PREFIX + channel)
+
+        async def messages():
+            async for item in pubsub.listen():
+                if item['type'] == 'message':
+                    yield json.loads(item['data'])
+
+        try:
+            yield messages()
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await client.aclose()
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    config = getattr(settings, 'PUBSUB', {'BACKEND': 'wey_backend.pubsub.InProcessBroker'})
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+
+
+def publish(channel, message):
+    """
+    Sends a JSON-serializable message to everyone subscribed to channel.
+    Delivery is best effort: nobody listening means the message is dropped,
+    and a broker outage is logged rather than failing the caller's request.
+    """
+    try:
+        get_broker().publish(channel, message)
+    except Exception:
+        logger.exception('Could not publish to %s', channel)
+
+
+def subscribe(channel):
+    """
+    Async context manager; messages published to channel once it has been
+    entered are delivered through the async iterator it yields:
+
+        async with subscribe(channel) as messages:
+            async for message in messages:
+                ...
+    """
+    return get_broker().subscribe(channel)
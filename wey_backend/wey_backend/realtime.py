@@ -0,0 +1,93 @@
+import asyncio
+import json
+from contextlib import suppress
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .pubsub import subscribe, user_channel
+
+
+WEBSOCKET_PATH = '/ws/'
+
+# Application-defined close code; rejected handshakes are seen as HTTP 403
+CLOSE_UNAUTHORIZED = 4001
+
+
+def _raw_token(scope):
+    # Browsers can't set headers on a WebSocket, so ?token= is accepted too
+    query = parse_qs(scope.get('query_string', b'').decode())
+
+    if query.get('token'):
+        return query['token'][0]
+
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            parts = value.decode().split()
+
+            if len(parts) == 2 and parts[0] == 'Bearer':
+                return parts[1]
+
+    return None
+
+
+async def authenticate(scope):
+    """
+    The user for the SimpleJWT access token on the connection, or None.
+    """
+    raw_token = _raw_token(scope)
+
+    if raw_token is None:
+        return None
+
+    auth = JWTAuthentication()
+
+    try:
+        token = auth.get_validated_token(raw_token)
+        return await sync_to_async(auth.get_user)(token)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def _forward(messages, send):
+    async for message in messages:
+        await send({'type': 'websocket.send', 'text': json.dumps(message, cls=DjangoJSONEncoder)})
+
+
+async def websocket_application(scope, receive, send):
+    """
+    One connection per signed-in client. Everything published to the
+    user's channel (see pubsub.user_channel) is sent down as JSON text
+    frames with a 'type' key, e.g. {'type': 'chat.message', ...}.
+    """
+    event = await receive()
+
+    if event['type'] != 'websocket.connect':
+        return
+
+    if scope['path'] != WEBSOCKET_PATH:
+        await send({'type': 'websocket.close'})
+        return
+
+    user = await authenticate(scope)
+
+    if user is None:
+        await send({'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+        return
+
+    async with subscribe(user_channel(user.id)) as messages:
+        await send({'type': 'websocket.accept'})
+        forward = asyncio.ensure_future(_forward(messages, send))
+
+        try:
+            # Nothing is expected from the client; wait for it to go away
+            while (await receive())['type'] != 'websocket.disconnect':
+                pass
+        finally:
+            forward.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await forward
@@ -0,0 +1,56 @@
+import logging
+import threading
+import time
+
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicRebuild:
+    """
+    Base for per-process, in-memory structures loaded from the database and
+    reloaded every `rebuild_interval` seconds.
+
+    Only the first load blocks the request that needs it. Later reloads run
+    on a background thread while readers keep using the current copy, and
+    at most one load runs at a time per process.
+
+    Subclasses implement rebuild(), which loads the data and swaps it in,
+    and may override is_stale() to reload for other reasons.
+    """
+
+    rebuild_interval = 10 * 60
+
+    def __init__(self):
+        self._built_at = None
+        self._rebuild_lock = threading.Lock()
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def _mark_built(self):
+        self._built_at = time.monotonic()
+
+    def is_stale(self):
+        return time.monotonic() - self._built_at > self.rebuild_interval
+
+    def _ensure_fresh(self):
+        if self._built_at is None:
+            # Nothing to serve yet; concurrent callers wait for one load
+            with self._rebuild_lock:
+                if self._built_at is None:
+                    self.rebuild()
+        elif self.is_stale() and self._rebuild_lock.acquire(blocking=False):
+            threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception:
+            # Keep serving the old copy; the next request tries again
+            logger.exception('background rebuild of %s failed', type(self).__name__)
+        finally:
+            self._rebuild_lock.release()
+            connections.close_all()
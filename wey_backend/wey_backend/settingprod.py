@@ -67,6 +67,9 @@ REST_FRAMEWORK = {
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Lets web clients read the ETag for conditional GETs of notifications
+CORS_EXPOSE_HEADERS = ['ETag']
+
 CSRF_TRUSTED_ORIGINS = [
     "https://cipher-connect-g9ok.onrender.com",
 ]
@@ -141,6 +144,39 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+    }
+}
+
+# Seconds that connection score increments are buffered before being written
+# (account/interactions.py). 0 writes them during the request.
+CONNECTION_BUFFER_FLUSH_INTERVAL = 5
+
+# Seconds that notifications are queued before being written and pushed
+# (notification/utils.py); likes or comments on one post in that window
+# are merged. 0 writes them during the request.
+NOTIFICATION_DISPATCH_INTERVAL = 2
+
+# Where offline batch jobs (wey_backend/jobs.py) checkpoint finished shards
+# so a crashed run can be resumed. Must survive a reboot, so not /tmp.
+JOB_CHECKPOINT_DIR = config('JOB_CHECKPOINT_DIR', default=str(BASE_DIR / 'job_checkpoints'))
+
+# Pub/sub for pushing events to WebSocket clients (wey_backend/pubsub.py).
+# The in-process broker only reaches connections held by the same process.
+PUBSUB = {
+    'BACKEND': 'wey_backend.pubsub.RedisBroker',
+    'OPTIONS': {
+        'url': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 